@@ -1,6 +1,4 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
 
 def normalize_angle(angle):
     """
@@ -51,6 +49,9 @@ class Camera:
 
     def plot_camera(self, ax):
         """ Dessine la caméra (un point) et son cône (un Wedge) """
+        # matplotlib n'est importé que pour dessiner : le calcul n'en dépend pas
+        import matplotlib.patches as patches
+
         # Le cône de vision (Wedge = part de camembert)
         # alpha gère la transparence
         wedge = patches.Wedge((self.x, self.y), self.radius, 
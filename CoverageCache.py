@@ -0,0 +1,119 @@
+from collections import OrderedDict
+import numpy as np
+from coverage import genes_visibility
+
+# Nombre de bits à 1 pour chaque octet (popcount par table de correspondance)
+POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class CoverageCache:
+    def __init__(self, room, fov, radius, max_bytes=64 * 1024**2, quantum=None, chunk_size=256):
+        """
+        Cache de la couverture de chaque caméra, stockée sous forme de bitset compact
+        (np.packbits) sur room.sample_points.
+        La fitness d'un individu devient le popcount du OU de ses bitsets.
+        max_bytes : budget mémoire des bitsets, les entrées les moins récemment
+                    utilisées sont évincées au-delà (LRU)
+        quantum : pas de quantification des gènes (x, y en mètres, angle en degrés).
+                  None = clé exacte, le résultat est alors identique au calcul direct.
+                  Avec un pas, la couverture d'une case est celle de la première caméra vue.
+        chunk_size : nombre de caméras calculées ensemble lors d'un défaut de cache
+        """
+        self.room = room
+        self.fov = fov
+        self.radius = radius
+        self.max_bytes = max_bytes
+        self.quantum = quantum
+        self.chunk_size = chunk_size
+        self.n_points = len(room.sample_points)
+        self.bitset_bytes = (self.n_points + 7) // 8
+        self.room_key = room.fingerprint()
+
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, gene):
+        """ Clé d'une caméra : pièce, fov, rayon et gène (éventuellement quantifié) """
+        x, y, angle = (float(v) for v in gene)
+        if self.quantum is not None:
+            x, y, angle = (round(v / self.quantum) for v in (x, y, angle))
+        return (self.room_key, self.fov, self.radius, x, y, angle)
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def used_bytes(self):
+        return len(self.entries) * self.bitset_bytes
+
+    def stats(self):
+        """ Compteurs pour dimensionner le cache """
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': len(self.entries),
+            'used_bytes': self.used_bytes,
+            'max_bytes': self.max_bytes,
+        }
+
+    def camera_bitsets(self, genes):
+        """
+        Bitsets (n, bitset_bytes) pour un tableau de gènes (n, 3).
+        Les caméras absentes du cache sont calculées ensemble, par paquets.
+        """
+        genes = np.asarray(genes, dtype=float).reshape(-1, 3)
+        bitsets = np.empty((len(genes), self.bitset_bytes), dtype=np.uint8)
+        keys = [self.key(gene) for gene in genes]
+
+        missing = {}
+        for i, key in enumerate(keys):
+            bitset = self.entries.get(key)
+            if bitset is not None:
+                self.entries.move_to_end(key)
+                bitsets[i] = bitset
+                self.hits += 1
+            elif key in missing:
+                # Même caméra deux fois dans le lot : un seul calcul
+                missing[key].append(i)
+                self.hits += 1
+            else:
+                missing[key] = [i]
+                self.misses += 1
+
+        if missing:
+            first = [indices[0] for indices in missing.values()]
+            for start in range(0, len(first), self.chunk_size):
+                chunk = first[start:start + self.chunk_size]
+                visible = genes_visibility(genes[chunk], self.fov, self.radius, self.room.sample_points)
+                packed = np.packbits(visible, axis=-1)
+                for i, bitset in zip(chunk, packed):
+                    self.store(keys[i], bitset)
+                    bitsets[missing[keys[i]]] = bitset
+
+        return bitsets
+
+    def store(self, key, bitset):
+        self.entries[key] = bitset
+        self.entries.move_to_end(key)
+        while self.entries and self.used_bytes > self.max_bytes:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def population_fitness(self, genes):
+        """
+        Fitness de toute une population (pop, n_cams, 3) :
+        popcount du OU des bitsets des caméras de chaque individu.
+        """
+        genes = np.asarray(genes, dtype=float)
+        pop_size, num_cameras = genes.shape[:2]
+        if self.n_points == 0:
+            return np.zeros(pop_size)
+        bitsets = self.camera_bitsets(genes.reshape(-1, 3)).reshape(pop_size, num_cameras, -1)
+        union = np.bitwise_or.reduce(bitsets, axis=1)
+        covered_count = POPCOUNT_TABLE[union].sum(axis=-1, dtype=np.int64)
+        return covered_count / self.n_points
@@ -1,5 +1,7 @@
 import random
+import numpy as np
 from Camera import Camera
+from coverage import coverage_counts, update_coverage_counts, counts_fraction
 
 class Individual:
     def __init__(self, room, num_cameras, fov, radius, genes=None):
@@ -8,20 +10,20 @@ class Individual:
         self.fov = fov
         self.radius = radius
         self.fitness = None
+        # Optionnel : nombre de caméras qui voient chaque point de room.sample_points.
+        # Quand il est présent, mutate met la fitness à jour de façon incrémentale.
+        self.coverage_counts = None
         
         if genes is None:
             # Création aléatoire (Naissance)
+            # Les positions sont tirées par lots dans la pièce (Room.random_points_inside),
+            # le générateur numpy est initialisé depuis random pour rester reproductible avec random.seed
+            rng = np.random.default_rng(random.getrandbits(64))
+            positions = room.random_points_inside(num_cameras, rng)
             self.genes = []
-            for _ in range(num_cameras):
-                # On cherche un point valide dans la pièce
-                # On essaie tant qu'on n'est pas dedans (méthode un peu brute mais efficace)
-                while True:
-                    x = random.uniform(room.bounds[0], room.bounds[1])
-                    y = random.uniform(room.bounds[2], room.bounds[3])
-                    if room.is_point_inside((x, y)):
-                        angle = random.uniform(0, 360)
-                        self.genes.append([x, y, angle])
-                        break
+            for x, y in positions:
+                angle = random.uniform(0, 360)
+                self.genes.append([float(x), float(y), angle])
         else:
             # Création à partir de gènes existants (Enfant)
             self.genes = genes
@@ -39,6 +41,11 @@ class Individual:
 
     def get_fitness(self):
         return self.fitness
+
+    def track_coverage(self):
+        """ Calcule les compteurs de couverture par point (et la fitness qui en découle) """
+        self.coverage_counts = coverage_counts(self.genes, self.fov, self.radius, self.room.sample_points)
+        self.fitness = counts_fraction(self.coverage_counts)
     
     def crossover(self, other_parent):
         """ Uniform Crossover : Pile ou face pour chaque gène """
@@ -67,6 +74,7 @@ class Individual:
         mutation_strength : De combien on bouge (ex: 1.0 mètre)
         """
         new_genes = []
+        moved = []
         for gene in self.genes:
             x, y, angle = gene
             
@@ -78,13 +86,23 @@ class Individual:
                 
                 # On modifie l'angle
                 angle += random.uniform(-20, 20) # +/- 20 degrés
-                
-                # IMPORTANT : On vérifie si la caméra est sortie de la pièce.
-                # Si elle est sortie, on annule le mouvement (ou on la remet au bord).
-                # Ici, on annule simplement la mutation spatiale si invalide.
-                if not self.room.is_point_inside((x, y)):
-                    x, y = gene[0], gene[1] # On revient à l'ancienne position
+                moved.append(len(new_genes))
             
             new_genes.append([x, y, angle])
+
+        # IMPORTANT : On vérifie si les caméras déplacées sont sorties de la pièce (un seul test par lot).
+        # Un déplacement invalide n'est pas annulé : la caméra s'arrête juste avant le mur.
+        if moved:
+            positions = self.room.clip_moves([self.genes[i][:2] for i in moved], [new_genes[i][:2] for i in moved])
+            for i, (x, y) in zip(moved, positions):
+                new_genes[i][0], new_genes[i][1] = float(x), float(y)
             
-        self.genes = new_genes
\ No newline at end of file
+        # Évaluation incrémentale : seules les caméras qui ont bougé sont recalculées
+        if self.coverage_counts is not None:
+            self.coverage_counts = update_coverage_counts(
+                self.coverage_counts,
+                [self.genes[i] for i in moved], [new_genes[i] for i in moved],
+                self.fov, self.radius, self.room.sample_points)
+            self.fitness = counts_fraction(self.coverage_counts)
+
+        self.genes = new_genes
@@ -0,0 +1,172 @@
+import numpy as np
+
+# Nombre maximal de couples (segment, mur) testés d'un coup : borne la mémoire des tableaux
+# intermédiaires de segments_cross (quelques tableaux float64 de cette taille)
+MAX_SEGMENT_WALL_PAIRS = 2**20
+
+
+def segments_cross(start, ends, walls):
+    """
+    Pour un point de départ (2,) et des extrémités (n, 2), indique si le segment start->end
+    coupe strictement au moins un mur (tableau (m, 2, 2)).
+    Un segment qui frôle un coin (points alignés) n'est pas considéré comme bloqué.
+    Retourne un tableau booléen (n,).
+    """
+    if len(walls) == 0 or len(ends) == 0:
+        return np.zeros(len(ends), dtype=bool)
+    a = walls[:, 0][None, :, :]   # (1, m, 2)
+    b = walls[:, 1][None, :, :]
+    p = np.asarray(start, dtype=float)[None, None, :]
+    q = ends[:, None, :]          # (n, 1, 2)
+
+    def orient(u, v, w):
+        return (v[..., 0] - u[..., 0]) * (w[..., 1] - u[..., 1]) - (v[..., 1] - u[..., 1]) * (w[..., 0] - u[..., 0])
+
+    # Les deux extrémités du mur de part et d'autre du segment, et inversement
+    d1 = orient(p, q, a)
+    d2 = orient(p, q, b)
+    d3 = orient(a, b, p)
+    d4 = orient(a, b, q)
+    crossing = (d1 * d2 < 0) & (d3 * d4 < 0)
+    return np.any(crossing, axis=1)
+
+
+class LineOfSightTable:
+    def __init__(self, room, cell_size=None, radius=None, max_pairs=MAX_SEGMENT_WALL_PAIRS):
+        """
+        Table de visibilité (occlusion par les murs) précalculée par case de position.
+        La pièce est découpée en cases de cell_size (par défaut room.sample_step) ;
+        pour chaque case, on calcule une fois quels points d'échantillonnage sont en ligne
+        de vue depuis un point de référence de la case, et on stocke le résultat en bitset.
+        Toutes les caméras d'une même case réutilisent ensuite cette ligne pendant tout le run :
+        l'occlusion ne coûte plus qu'une lecture et un ET logique à l'évaluation.
+        Approximation : la ligne de vue est celle du point de référence de la case.
+        radius : portée des caméras. Seuls les points à portée d'une caméra de la case
+        (index spatial de la pièce) et les murs dont la boîte touche ces segments sont testés ;
+        les autres points sont marqués non visibles (de toute façon hors de portée).
+        max_pairs : couples (point, mur) testés par paquet, pour borner la mémoire.
+        """
+        self.room = room
+        self.cell_size = float(cell_size or room.sample_step)
+        self.radius = radius
+        self.max_pairs = max_pairs
+        self.points = room.sample_points.reshape(-1, 2)
+        self.n_points = len(self.points)
+        self.walls = room.walls()
+        self.wall_boxes = np.column_stack([
+            self.walls[:, :, 0].min(axis=1), self.walls[:, :, 0].max(axis=1),
+            self.walls[:, :, 1].min(axis=1), self.walls[:, :, 1].max(axis=1),
+        ])
+
+        min_x, max_x, min_y, max_y = room.bounds
+        self.origin = np.array([min_x, min_y], dtype=float)
+        self.n_cols = max(int(np.ceil((max_x - min_x) / self.cell_size)), 1)
+        self.n_rows = max(int(np.ceil((max_y - min_y) / self.cell_size)), 1)
+
+        # Lignes calculées à la demande : case -> bitset (seules les cases visitées coûtent de la mémoire)
+        self.rows = {}
+
+    def cells_of(self, x, y):
+        """ Indice de case pour des positions (tableaux de même forme) """
+        col = np.clip(np.floor((np.asarray(x) - self.origin[0]) / self.cell_size), 0, self.n_cols - 1)
+        row = np.clip(np.floor((np.asarray(y) - self.origin[1]) / self.cell_size), 0, self.n_rows - 1)
+        return (row * self.n_cols + col).astype(np.int64)
+
+    def reference_point(self, cell):
+        """
+        Point depuis lequel la ligne de vue d'une case est calculée : le centre de la case,
+        ou, si ce centre est hors de la pièce (case contre un mur), un point de la case à l'intérieur.
+        Si aucun point testé de la case n'est dedans (case presque entièrement hors de la pièce,
+        par exemple sur un coin rentrant), le sommet de la pièce situé dans la case, ou à défaut le
+        point des murs le plus proche du centre : une ligne de vue qui part d'un mur n'est bloquée
+        que si elle coupe franchement un autre mur.
+        """
+        row, col = divmod(int(cell), self.n_cols)
+        offsets = (np.arange(5) + 0.5) / 5
+        sub_x = self.origin[0] + (col + offsets) * self.cell_size
+        sub_y = self.origin[1] + (row + offsets) * self.cell_size
+        center = np.array([[self.origin[0] + (col + 0.5) * self.cell_size,
+                            self.origin[1] + (row + 0.5) * self.cell_size]])
+        candidates = np.vstack([center, np.array(np.meshgrid(sub_x, sub_y)).reshape(2, -1).T])
+        inside = self.room.are_points_inside(candidates)
+        if np.any(inside):
+            return candidates[np.argmax(inside)]
+        # Sommet de la pièce dans la case (coin rentrant), sinon point des murs le plus proche du centre
+        a, b = self.walls[:, 0], self.walls[:, 1]
+        low = self.origin + np.array([col, row]) * self.cell_size
+        in_cell = np.all((a >= low) & (a <= low + self.cell_size), axis=1)
+        if np.any(in_cell):
+            vertices = a[in_cell]
+            return vertices[np.argmin(np.sum((vertices - center) ** 2, axis=1))]
+        ab = b - a
+        t = np.clip(np.sum((center - a) * ab, axis=1) / np.maximum(np.sum(ab * ab, axis=1), 1e-300), 0, 1)
+        projections = a + t[:, None] * ab
+        return projections[np.argmin(np.sum((projections - center) ** 2, axis=1))]
+
+    def compute(self, cells):
+        """ Calcule (une seule fois) les lignes de la table pour les cases demandées """
+        for cell in np.unique(cells):
+            cell = int(cell)
+            if cell in self.rows:
+                continue
+            start = self.reference_point(cell)
+            visible = np.zeros(self.n_points, dtype=bool)
+            candidates = self.points_in_reach(start)
+            chunk_size = self.chunk_size(start, self.points[candidates])
+            for i in range(0, len(candidates), chunk_size):
+                indices = candidates[i:i + chunk_size]
+                ends = self.points[indices]
+                visible[indices] = ~segments_cross(start, ends, self.walls_near(start, ends))
+            self.rows[cell] = np.packbits(visible)
+
+    def points_in_reach(self, start):
+        """ Indices des points qu'une caméra de la case de start peut voir (tous sans radius) """
+        if self.radius is None:
+            return np.arange(self.n_points)
+        # Une caméra est au plus à une diagonale de case du point de référence
+        reach = self.radius + self.cell_size * np.sqrt(2)
+        x, y = start
+        indices = self.room.get_spatial_index().query_box(x - reach, x + reach, y - reach, y + reach)
+        distance_sq = np.sum((self.points[indices] - start) ** 2, axis=1)
+        return np.sort(indices[distance_sq <= reach * reach])
+
+    def walls_near(self, start, ends):
+        """ Murs dont la boîte englobante touche celle des segments start -> ends """
+        if len(ends) == 0:
+            return self.walls[:0]
+        min_x, min_y = np.minimum(ends.min(axis=0), start)
+        max_x, max_y = np.maximum(ends.max(axis=0), start)
+        boxes = self.wall_boxes
+        keep = (boxes[:, 0] <= max_x) & (boxes[:, 1] >= min_x) & (boxes[:, 2] <= max_y) & (boxes[:, 3] >= min_y)
+        return self.walls[keep]
+
+    def chunk_size(self, start, ends):
+        """ Nombre de points par paquet pour rester sous max_pairs couples (point, mur) """
+        return max(1, self.max_pairs // max(len(self.walls_near(start, ends)), 1))
+
+    def precompute(self):
+        """ Calcule toute la table d'avance (toutes les cases de la grille) """
+        self.compute(np.arange(self.n_rows * self.n_cols))
+
+    def packed_rows(self, x, y):
+        """ Bitsets de ligne de vue (forme de x + (n_bytes,)) pour des positions de caméras """
+        cells = self.cells_of(x, y)
+        unique, inverse = np.unique(cells, return_inverse=True)
+        self.compute(unique)
+        table = np.stack([self.rows[int(cell)] for cell in unique])
+        return table[inverse.reshape(cells.shape)]
+
+    def visible_mask(self, x, y, start=0, stop=None):
+        """
+        Masque booléen (forme de x + (n,)) des points [start, stop) en ligne de vue.
+        start doit être un multiple de 8 (alignement des bitsets).
+        Pour plusieurs paquets de points avec les mêmes caméras, construire packed_rows une fois
+        et appeler unpack_rows par paquet.
+        """
+        return self.unpack_rows(self.packed_rows(x, y), start, stop)
+
+    def unpack_rows(self, packed, start=0, stop=None):
+        """ Masque des points [start, stop) à partir de bitsets donnés par packed_rows (sans copie de la table) """
+        stop = self.n_points if stop is None else min(stop, self.n_points)
+        packed = packed[..., start // 8:(stop + 7) // 8]
+        return np.unpackbits(packed, axis=-1, count=stop - start).astype(bool)
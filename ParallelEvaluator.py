@@ -0,0 +1,90 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory, util
+import numpy as np
+import profiling
+from coverage import population_coverage
+
+# État de chaque processus worker (rempli une seule fois par init_worker)
+WORKER_STATE = {}
+
+
+def publish_array(array):
+    """ Copie un tableau numpy dans un bloc de mémoire partagée, retourne (bloc, description) """
+    array = np.ascontiguousarray(array, dtype=float)
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return block, (block.name, array.shape)
+
+
+def attach_array(description):
+    """ Ouvre (côté worker) un tableau publié par publish_array, sans copie """
+    name, shape = description
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=float, buffer=block.buf)
+
+
+def init_worker(points_description, fov, radius, chunk_size):
+    """ Initialisation d'un worker : on se rattache une fois pour toutes à la mémoire partagée """
+    points_block, points = attach_array(points_description)
+    WORKER_STATE.update({
+        'block': points_block,
+        'sample_points': points,
+        'fov': fov,
+        'radius': radius,
+        'chunk_size': chunk_size,
+    })
+    # Fermeture du bloc à la sortie du worker (le processus principal se charge de unlink)
+    util.Finalize(None, close_worker, exitpriority=10)
+
+
+def close_worker():
+    """ Libère la vue sur la mémoire partagée puis ferme le bloc du worker """
+    WORKER_STATE.pop('sample_points', None)
+    block = WORKER_STATE.pop('block', None)
+    if block is not None:
+        block.close()
+
+
+def evaluate_chunk(genes):
+    """ Tâche d'un worker : reçoit seulement des gènes (k, n_cams, 3), renvoie k fitness """
+    return population_coverage(genes, WORKER_STATE['fov'], WORKER_STATE['radius'],
+                               WORKER_STATE['sample_points'], chunk_size=WORKER_STATE['chunk_size'])
+
+
+class ParallelEvaluator:
+    def __init__(self, room, fov, radius, workers, chunk_size=4096):
+        """
+        Évaluation de la fitness répartie sur un pool de processus.
+        room.sample_points est publié une seule fois en mémoire partagée : seuls les tableaux
+        de gènes partent vers les workers et seules les fitness reviennent. Le résultat est identique à l'évaluation en série.
+        À utiliser avec "with" (ou appeler close()) pour libérer la mémoire partagée.
+        """
+        self.workers = workers
+        self.n_points = len(room.sample_points)
+        self.points_block, points_description = publish_array(room.sample_points.reshape(-1, 2))
+        self.pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_worker,
+            initargs=(points_description, fov, radius, chunk_size),
+        )
+
+    def evaluate(self, genes):
+        """ Fitness d'un lot de gènes (k, n_cams, 3), découpé en une part par worker """
+        genes = np.asarray(genes, dtype=float)
+        if len(genes) == 0:
+            return np.zeros(0)
+        # Les tests de visibilité ont lieu dans les workers : on les compte ici
+        profiling.count('visibility_tests', genes.shape[0] * genes.shape[1] * self.n_points)
+        parts = np.array_split(genes, min(self.workers, len(genes)))
+        return np.concatenate(list(self.pool.map(evaluate_chunk, parts)))
+
+    def close(self):
+        self.pool.shutdown()
+        self.points_block.close()
+        self.points_block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,102 @@
+import numpy as np
+from selection import alias_table, alias_draw
+
+
+class PlacementSampler:
+    def __init__(self, walls):
+        """
+        Tirage uniforme de positions dans une pièce, sans rejet.
+        La pièce (murs : tableau (n, 2, 2), contour et trous) est découpée une seule fois en
+        bandes verticales entre deux abscisses de sommets consécutives : dans une bande, aucun
+        mur ne commence ni ne finit, les murs qui la traversent sont donc ordonnés de bas en haut
+        et, par la règle pair-impair (comme Room.is_point_inside), l'intérieur est fait des
+        trapèzes entre le 1er et le 2e mur, le 3e et le 4e... Chaque trapèze est coupé en deux
+        triangles ; un tirage choisit un triangle selon son aire (table d'alias) puis un point
+        uniforme dans ce triangle.
+        triangles : tableau (n_triangles, 3, 2), areas : aire de chaque triangle.
+        """
+        self.walls = np.asarray(walls, dtype=float).reshape(-1, 2, 2)
+        x_a, y_a = self.walls[:, 0, 0], self.walls[:, 0, 1]
+        x_b, y_b = self.walls[:, 1, 0], self.walls[:, 1, 1]
+        # Les murs verticaux ne traversent aucune bande
+        sloped = x_a != x_b
+        x_min, x_max = np.minimum(x_a, x_b), np.maximum(x_a, x_b)
+        slope = np.where(sloped, (y_b - y_a) / np.where(sloped, x_b - x_a, 1.0), 0.0)
+
+        triangles = []
+        xs = np.unique(self.walls[:, :, 0])
+        for x0, x1 in zip(xs[:-1], xs[1:]):
+            crossing = np.flatnonzero(sloped & (x_min <= x0) & (x_max >= x1))
+            if len(crossing) < 2:
+                continue
+            y0 = y_a[crossing] + slope[crossing] * (x0 - x_a[crossing])
+            y1 = y_a[crossing] + slope[crossing] * (x1 - x_a[crossing])
+            # Ordre de bas en haut au milieu de la bande (les murs ne s'y croisent pas)
+            order = np.argsort(y0 + y1, kind="stable")
+            y0, y1 = y0[order], y1[order]
+            n_pairs = len(crossing) // 2
+            bottom0, top0 = y0[0:2 * n_pairs:2], y0[1:2 * n_pairs:2]
+            bottom1, top1 = y1[0:2 * n_pairs:2], y1[1:2 * n_pairs:2]
+            for b0, t0, b1, t1 in zip(bottom0, top0, bottom1, top1):
+                triangles.append(((x0, b0), (x1, b1), (x1, t1)))
+                triangles.append(((x0, b0), (x1, t1), (x0, t0)))
+
+        triangles = np.array(triangles, dtype=float).reshape(-1, 3, 2)
+        edge_1 = triangles[:, 1] - triangles[:, 0]
+        edge_2 = triangles[:, 2] - triangles[:, 0]
+        areas = np.abs(edge_1[:, 0] * edge_2[:, 1] - edge_1[:, 1] * edge_2[:, 0]) / 2
+        # Les triangles plats (trapèze réduit à un triangle) ne sont jamais tirés
+        keep = areas > 0
+        self.triangles = triangles[keep]
+        self.areas = areas[keep]
+        if len(self.areas) == 0:
+            raise ValueError("La pièce n'a pas d'intérieur : impossible d'y placer des caméras.")
+        self.prob, self.alias = alias_table(self.areas)
+
+    def __len__(self):
+        return len(self.triangles)
+
+    @property
+    def area(self):
+        """ Surface de la pièce (trous déduits) """
+        return float(np.sum(self.areas))
+
+    def sample(self, count, rng):
+        """ count points (tableau (count, 2)) tirés uniformément dans la pièce """
+        picks = alias_draw(self.prob, self.alias, count, rng)
+        u = rng.random(count)
+        v = rng.random(count)
+        # Point du parallélogramme replié dans le triangle
+        outside = u + v > 1
+        u[outside], v[outside] = 1 - u[outside], 1 - v[outside]
+        corner = self.triangles[picks, 0]
+        return (corner + u[:, None] * (self.triangles[picks, 1] - corner)
+                + v[:, None] * (self.triangles[picks, 2] - corner))
+
+    def clip_moves(self, origins, targets, margin=1e-6, chunk_size=4096):
+        """
+        Déplacements origins -> targets (tableaux (n, 2)) arrêtés au premier mur traversé :
+        retourne le point du segment margin mètres avant ce mur, ou la cible si aucun mur n'est
+        traversé. Une origine posée sur un mur peut donner un point dehors : le résultat doit
+        être vérifié (voir Room.clip_moves).
+        """
+        origins = np.asarray(origins, dtype=float).reshape(-1, 2)
+        targets = np.asarray(targets, dtype=float).reshape(-1, 2)
+        start, edge = self.walls[:, 0], self.walls[:, 1] - self.walls[:, 0]
+        positions = targets.copy()
+        for first in range(0, len(origins), chunk_size):
+            p = origins[first:first + chunk_size, None, :]
+            d = targets[first:first + chunk_size, None, :] - p
+            # p + t.d = start + s.edge, résolu pour chaque couple (déplacement, mur)
+            denom = d[..., 0] * edge[:, 1] - d[..., 1] * edge[:, 0]
+            offset = start - p
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t = (offset[..., 0] * edge[:, 1] - offset[..., 1] * edge[:, 0]) / denom
+                s = (offset[..., 0] * d[..., 1] - offset[..., 1] * d[..., 0]) / denom
+            hits = (denom != 0) & (t > 0) & (t <= 1) & (s >= 0) & (s <= 1)
+            t_hit = np.min(np.where(hits, t, 1.0), axis=1)
+            # On s'arrête margin mètres avant le mur (distance absolue, pas une fraction du déplacement)
+            length = np.hypot(d[:, 0, 0], d[:, 0, 1])
+            t_hit = np.where(t_hit < 1.0, np.maximum(t_hit - margin / np.maximum(length, 1e-300), 0.0), 1.0)
+            positions[first:first + chunk_size] = p[:, 0] + t_hit[:, None] * d[:, 0]
+        return positions
@@ -0,0 +1,348 @@
+import numpy as np
+import profiling
+from Individual import Individual
+from coverage import (population_coverage, indexed_population_coverage, tiled_population_coverage,
+                      genes_visibility)
+from selection import roulette_selection_batch
+
+
+class Population:
+    def __init__(self, room, num_cameras, fov, radius, genes, fitness=None, rng=None, coverage=None):
+        """
+        Population stockée sous forme de tableaux contigus :
+        genes : tableau (pop_size, num_cameras, 3) avec [x, y, angle en degrés]
+        fitness : tableau (pop_size,), NaN tant que l'individu n'est pas évalué
+        La pièce n'est référencée qu'une seule fois (pas par chaque individu).
+        coverage : suivi optionnel de la couverture pour l'évaluation incrémentale,
+                   tuple (counts, camera_bits, dirty) :
+                   - counts (pop_size, n_points) : nombre de caméras qui voient chaque point
+                   - camera_bits (pop_size, num_cameras, n_bytes) : couverture de chaque caméra (np.packbits)
+                   - dirty (pop_size, num_cameras) : caméras dont la couverture reste à calculer
+                     (leur contribution n'est pas encore dans counts)
+        """
+        self.room = room
+        self.num_cameras = num_cameras
+        self.fov = fov
+        self.radius = radius
+        self.genes = np.asarray(genes, dtype=float)
+        if fitness is None:
+            fitness = np.full(len(self.genes), np.nan)
+        self.fitness = np.asarray(fitness, dtype=float)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.counts, self.camera_bits, self.dirty = coverage if coverage is not None else (None, None, None)
+
+        # Nombre de couvertures de caméras calculées (pour mesurer le gain de l'incrémental)
+        self.camera_evaluations = 0
+
+    @classmethod
+    def random(cls, room, num_cameras, fov, radius, pop_size, rng=None, track_coverage=False):
+        """
+        Génération 0 : toutes les caméras sont placées au hasard dans la pièce, par lots.
+        track_coverage : active le suivi de couverture pour l'évaluation incrémentale.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        positions = room.random_points_inside(pop_size * num_cameras, rng)
+        angles = rng.uniform(0, 360, size=(pop_size * num_cameras, 1))
+        genes = np.hstack([positions, angles]).reshape(pop_size, num_cameras, 3)
+        return cls.from_arrays(room, num_cameras, fov, radius, genes, rng=rng, track_coverage=track_coverage)
+
+    @classmethod
+    def from_arrays(cls, room, num_cameras, fov, radius, genes, fitness=None, rng=None, track_coverage=False,
+                    dirty=None):
+        """
+        Population à partir de tableaux existants (par exemple relus d'un checkpoint).
+        Avec track_coverage, la couverture n'est pas connue :
+        - avec dirty (caméras dont la couverture restait à calculer, voir __init__), la couverture
+          des autres caméras est reconstruite tout de suite, sans compter dans camera_evaluations,
+          et les fitness connues sont gardées : la suite est la même que sans interruption ;
+        - sans dirty, tous les individus seront ré-évalués.
+        """
+        genes = np.asarray(genes, dtype=float)
+        coverage = None
+        if track_coverage:
+            pop_size = len(genes)
+            n_points = len(room.sample_points)
+            coverage = (
+                np.zeros((pop_size, n_points), dtype=np.uint16),
+                np.zeros((pop_size, num_cameras, (n_points + 7) // 8), dtype=np.uint8),
+                np.ones((pop_size, num_cameras), dtype=bool),
+            )
+            if dirty is None:
+                fitness = None
+        population = cls(room, num_cameras, fov, radius, genes, fitness, rng=rng, coverage=coverage)
+        if track_coverage and dirty is not None:
+            population.add_camera_coverage(*np.nonzero(~np.asarray(dirty, dtype=bool)))
+        return population
+
+    @property
+    def tracks_coverage(self):
+        return self.counts is not None
+
+    def __len__(self):
+        return len(self.genes)
+
+    def unevaluated(self):
+        """ Indices des individus dont la fitness n'est pas encore connue """
+        return np.flatnonzero(np.isnan(self.fitness))
+
+    def evaluate(self, chunk_size=4096, cache=None, evaluator=None, spatial_index=None, line_of_sight=None,
+                 tiles=None):
+        """
+        Évalue en un seul calcul vectorisé tous les individus non évalués.
+        cache : CoverageCache optionnel, les caméras déjà vues ne sont pas recalculées.
+        evaluator : ParallelEvaluator optionnel, le calcul est réparti sur ses workers.
+        spatial_index : SpatialIndex optionnel, chaque caméra n'est testée que sur les points à sa portée.
+        line_of_sight : LineOfSightTable optionnelle (occlusion par les murs, mode par lot uniquement).
+        tiles : SampleTiles optionnel, évaluation tuile par tuile (seules les tuiles à portée sont lues).
+        Avec le suivi de couverture, seules les caméras modifiées sont recalculées.
+        """
+        pending = self.unevaluated()
+        if len(pending) == 0:
+            return
+        if self.tracks_coverage:
+            self.evaluate_incremental(pending, chunk_size=chunk_size)
+        elif cache is not None:
+            self.fitness[pending] = cache.population_fitness(self.genes[pending])
+        elif evaluator is not None:
+            self.fitness[pending] = evaluator.evaluate(self.genes[pending])
+            self.camera_evaluations += len(pending) * self.num_cameras
+        elif tiles is not None:
+            self.fitness[pending] = tiled_population_coverage(
+                self.genes[pending], self.fov, self.radius, tiles, chunk_size=chunk_size)
+            self.camera_evaluations += len(pending) * self.num_cameras
+        elif spatial_index is not None:
+            self.fitness[pending] = indexed_population_coverage(
+                self.genes[pending], self.fov, self.radius, self.room.sample_points, spatial_index)
+            self.camera_evaluations += len(pending) * self.num_cameras
+        else:
+            self.fitness[pending] = population_coverage(
+                self.genes[pending], self.fov, self.radius,
+                self.room.sample_points, chunk_size=chunk_size, line_of_sight=line_of_sight)
+            self.camera_evaluations += len(pending) * self.num_cameras
+
+    def evaluate_racing(self, sample_size=512, delta=0.05, chunk_size=4096):
+        """
+        Évaluation par "course" : chaque individu non évalué est d'abord noté sur un
+        sous-ensemble aléatoire de sample_size points, avec un intervalle de confiance de Hoeffding
+        (erreur au plus eps = sqrt(ln(1/delta) / (2 * sample_size)) avec probabilité 1 - delta).
+        Seuls les candidats dont la borne haute peut atteindre le seuil des survivants
+        (plus mauvaise fitness déjà connue) sont évalués sur tous les points ;
+        les autres gardent leur estimation.
+        Retourne le nombre d'évaluations complètes évitées.
+        """
+        pending = self.unevaluated()
+        points = self.room.sample_points
+        known = np.flatnonzero(~np.isnan(self.fitness))
+        if len(pending) == 0 or len(known) == 0 or sample_size >= len(points):
+            self.evaluate(chunk_size=chunk_size)
+            return 0
+
+        cutoff = np.min(self.fitness[known])
+        subset = points[self.rng.choice(len(points), size=sample_size, replace=False)]
+        estimate = population_coverage(self.genes[pending], self.fov, self.radius, subset, chunk_size=chunk_size)
+        eps = np.sqrt(np.log(1 / delta) / (2 * sample_size))
+
+        contenders = pending[estimate + eps >= cutoff]
+        rejected = pending[estimate + eps < cutoff]
+        self.fitness[rejected] = estimate[estimate + eps < cutoff]
+        if len(contenders) > 0:
+            self.fitness[contenders] = population_coverage(
+                self.genes[contenders], self.fov, self.radius, points, chunk_size=chunk_size)
+        self.camera_evaluations += len(contenders) * self.num_cameras
+        return len(rejected)
+
+    def evaluate_incremental(self, pending, chunk_size=4096):
+        """
+        Ajoute aux compteurs la couverture des caméras "dirty" des individus pending,
+        puis en déduit la fitness (part des points vus au moins une fois).
+        """
+        n_points = len(self.room.sample_points)
+        rows, cams = np.nonzero(self.dirty[pending])
+        rows = pending[rows]
+        self.add_camera_coverage(rows, cams, chunk_size=chunk_size)
+        self.camera_evaluations += len(rows)
+
+        if n_points == 0:
+            self.fitness[pending] = 0.0
+        else:
+            self.fitness[pending] = np.count_nonzero(self.counts[pending], axis=-1) / n_points
+
+    def add_camera_coverage(self, rows, cams, chunk_size=4096):
+        """ Calcule la couverture des caméras (rows[k], cams[k]) et l'ajoute aux compteurs """
+        points = self.room.sample_points
+        # Paquets de caméras pour borner la mémoire (n_caméras * n_points booléens)
+        per_chunk = max(1, chunk_size * 64 // max(len(points), 1))
+        for start in range(0, len(rows), per_chunk):
+            r = rows[start:start + per_chunk]
+            c = cams[start:start + per_chunk]
+            visible = genes_visibility(self.genes[r, c], self.fov, self.radius, points)
+            self.camera_bits[r, c] = np.packbits(visible, axis=-1)
+            add_rows(self.counts, r, c, visible)
+        self.dirty[rows, cams] = False
+
+    def sort(self):
+        """ Trie la population du meilleur au moins bon (tri stable) """
+        order = np.argsort(-self.fitness, kind="stable")
+        self.genes = self.genes[order]
+        self.fitness = self.fitness[order]
+        if self.tracks_coverage:
+            self.counts = self.counts[order]
+            self.camera_bits = self.camera_bits[order]
+            self.dirty = self.dirty[order]
+
+    def individual(self, index):
+        """ Vue "Individual" d'une ligne de la population (pour main.py et le dessin) """
+        ind = Individual(self.room, self.num_cameras, self.fov, self.radius,
+                         genes=self.genes[index].copy())
+        if not np.isnan(self.fitness[index]):
+            ind.set_fitness(float(self.fitness[index]))
+        if self.tracks_coverage and not np.any(self.dirty[index]):
+            ind.coverage_counts = self.counts[index].astype(np.int32)
+        return ind
+
+    def individuals(self):
+        return [self.individual(i) for i in range(len(self))]
+
+    def select_parents(self, count, selection=None):
+        """
+        Tire count parents d'un coup, retourne leurs indices.
+        selection : opérateur par lot de selection.py (fitness, count, rng) -> indices ;
+                    par défaut la roulette (table d'alias construite une fois par génération).
+        """
+        selection = selection or roulette_selection_batch
+        return selection(self.fitness, count, self.rng)
+
+    def replace_worst(self, genes, fitness):
+        """
+        Remplace les derniers individus (population triée) par des migrants venus d'une autre île.
+        genes : (k, num_cameras, 3), fitness : (k,)
+        """
+        count = min(len(genes), len(self))
+        if count == 0:
+            return
+        self.genes[-count:] = genes[:count]
+        self.fitness[-count:] = fitness[:count]
+        if self.tracks_coverage:
+            # La couverture des migrants n'est pas connue ici : elle sera recalculée
+            self.counts[-count:] = 0
+            self.dirty[-count:] = True
+            self.fitness[-count:] = np.nan
+
+    def crossover(self, parents_a, parents_b, return_mask=False):
+        """
+        Uniform Crossover par masque booléen : pile ou face pour chaque caméra de chaque couple.
+        Retourne les gènes des enfants, entrelacés (enfant1, enfant2, enfant1, ...).
+        return_mask : retourne aussi le masque (n_enfants, num_cameras) des caméras
+                      venant du parent A.
+        """
+        genes_a = self.genes[parents_a]
+        genes_b = self.genes[parents_b]
+        keep = self.rng.random((len(parents_a), self.num_cameras, 1)) < 0.5
+        child1 = np.where(keep, genes_a, genes_b)
+        child2 = np.where(keep, genes_b, genes_a)
+        children = np.empty((2 * len(parents_a), self.num_cameras, 3))
+        children[0::2] = child1
+        children[1::2] = child2
+        if not return_mask:
+            return children
+        from_a = np.empty((2 * len(parents_a), self.num_cameras), dtype=bool)
+        from_a[0::2] = keep[..., 0]
+        from_a[1::2] = ~keep[..., 0]
+        return children, from_a
+
+    def mutate(self, genes, mutation_rate, mutation_strength, return_mask=False):
+        """
+        Mutation de tout un lot de gènes (tableau (n, num_cameras, 3)) avec des tirages groupés.
+        Les déplacements qui sortent de la pièce s'arrêtent juste avant le mur (Room.clip_moves),
+        comme dans Individual.mutate.
+        return_mask : retourne aussi le masque (n, num_cameras) des caméras mutées.
+        """
+        genes = genes.copy()
+        shape = genes.shape[:2]
+        mutated = self.rng.random(shape) < mutation_rate
+        n_mutated = np.count_nonzero(mutated)
+        if n_mutated > 0:
+            moves = self.rng.uniform(-mutation_strength, mutation_strength, size=(n_mutated, 2))
+            turns = self.rng.uniform(-20, 20, size=n_mutated)
+
+            origins = genes[mutated][:, :2]
+            positions = self.room.clip_moves(origins, origins + moves)
+
+            genes[mutated, 0] = positions[:, 0]
+            genes[mutated, 1] = positions[:, 1]
+            genes[mutated, 2] += turns
+        if return_mask:
+            return genes, mutated
+        return genes
+
+    def next_generation(self, survivors_count, mutation_rate, mutation_strength, selection=None):
+        """
+        Conserve les survivors_count premiers individus (population triée) et complète
+        avec des enfants issus de croisements/mutations.
+        selection : opérateur de sélection optionnel (voir select_parents).
+        """
+        children_count = len(self) - survivors_count
+        pairs = (children_count + 1) // 2
+        with profiling.phase('selection'):
+            parents_a = self.select_parents(pairs, selection)
+            parents_b = self.select_parents(pairs, selection)
+        with profiling.phase('crossover'):
+            children, from_a = self.crossover(parents_a, parents_b, return_mask=True)
+        with profiling.phase('mutation'):
+            children, mutated = self.mutate(children[:children_count], mutation_rate,
+                                            mutation_strength, return_mask=True)
+
+        genes = np.concatenate([self.genes[:survivors_count], children])
+        fitness = np.concatenate([self.fitness[:survivors_count], np.full(children_count, np.nan)])
+        coverage = None
+        if self.tracks_coverage:
+            # L'enfant 1 d'un couple part du parent A, l'enfant 2 du parent B
+            first = np.arange(children_count) % 2 == 0
+            pair = np.arange(children_count) // 2
+            base = np.where(first, parents_a[pair], parents_b[pair])
+            other = np.where(first, parents_b[pair], parents_a[pair])
+            from_base = np.where(first[:, None], from_a[:children_count], ~from_a[:children_count])
+            with profiling.phase('coverage_inheritance'):
+                child_coverage = self.inherit_coverage(base, other, from_base, mutated)
+            coverage = tuple(np.concatenate([parent[:survivors_count], child]) for parent, child
+                             in zip((self.counts, self.camera_bits, self.dirty), child_coverage))
+
+        population = Population(self.room, self.num_cameras, self.fov, self.radius,
+                                genes, fitness, rng=self.rng, coverage=coverage)
+        population.camera_evaluations = self.camera_evaluations
+        return population
+
+    def inherit_coverage(self, base, other, from_base, mutated):
+        """
+        Couverture des enfants déduite de celle des parents (déjà évalués), sans recalcul :
+        on part des compteurs du parent "base", on retire les caméras qui ne viennent pas
+        de lui (ou qui ont muté) et on ajoute celles, non mutées, héritées de l'autre parent.
+        Les caméras mutées restent "dirty" : elles seront calculées à l'évaluation.
+        """
+        n_points = self.counts.shape[1]
+        counts = self.counts[base].astype(np.int32)
+        camera_bits = np.where(from_base[..., None], self.camera_bits[base], self.camera_bits[other])
+
+        # Les bits ne sont dépaquetés que pour les caméras qui changent
+        rows, cams = np.nonzero(~from_base | mutated)
+        removed = np.unpackbits(self.camera_bits[base[rows], cams], axis=-1, count=n_points)
+        add_rows(counts, rows, cams, removed, sign=-1)
+
+        rows, cams = np.nonzero(~from_base & ~mutated)
+        added = np.unpackbits(self.camera_bits[other[rows], cams], axis=-1, count=n_points)
+        add_rows(counts, rows, cams, added)
+
+        return counts.astype(np.uint16), camera_bits, mutated.copy()
+
+
+def add_rows(counts, rows, cams, values, sign=1):
+    """
+    counts[rows[k]] += sign * values[k], sans perdre de mise à jour quand une ligne
+    apparaît plusieurs fois : une ligne n'apparaît qu'une fois par caméra.
+    """
+    for j in np.unique(cams):
+        selected = cams == j
+        if sign > 0:
+            counts[rows[selected]] += values[selected]
+        else:
+            counts[rows[selected]] -= values[selected]
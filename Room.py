@@ -1,18 +1,30 @@
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
+import copy
+import hashlib
 import numpy as np
+import profiling
+from PlacementSampler import PlacementSampler
+from SampleTiles import SampleTiles
+
+# Nombre maximal de couples (point, arête) testés d'un coup par are_points_inside : borne la mémoire
+# des tableaux intermédiaires (quelques tableaux float64 de cette taille) quel que soit le nombre d'arêtes
+MAX_POINT_EDGE_PAIRS = 2**20
 
 
 class Room:
-    def __init__(self, corners, sample_step=1.0):
+    def __init__(self, corners, sample_step=1.0, holes=None, tile_size=None):
         """
         Définit une pièce par une liste de coordonnées de ses coins.
         L'ordre des points est important (sens horaire ou anti-horaire).
         corners: liste de tuples [(x1,y1), (x2,y2), ...]
         sample_step: l'espacement entre les points d'échantillonnage
+        holes: trous intérieurs optionnels (piliers, racks...), liste de polygones comme corners.
+               Un point dans un trou n'est pas dans la pièce, et les bords des trous sont des murs.
+        tile_size: pour les très grandes pièces, les points d'échantillonnage sont construits et
+               stockés par tuiles de tile_size mètres, en float32 (voir SampleTiles.py)
         """
         # On s'assure que c'est un tableau numpy pour faciliter les calculs futurs
         self.corners = np.array(corners)
+        self.holes = [np.array(hole) for hole in (holes or [])]
         
         # Pour fermer le polygone lors du dessin, on répète le premier point à la fin
         self.plot_corners = np.vstack([self.corners, self.corners[0]])
@@ -23,64 +35,267 @@ class Room:
             np.min(self.corners[:, 1]), np.max(self.corners[:, 1])
         )
         
-        # Génération des points d'échantillonnage
+        # Génération des points d'échantillonnage (par tuiles si tile_size est donné)
         self.sample_step = sample_step
-        self.sample_points = self.generate_sample_points(sample_step)
+        self.tile_size = tile_size
+        self.tiles = None
+        if tile_size is None:
+            self.sample_points = self.generate_sample_points(sample_step)
+        else:
+            self.tiles = SampleTiles(self, sample_step, tile_size)
+            self.sample_points = self.tiles.points
+
+        # Index spatial des points d'échantillonnage, construit à la première utilisation
+        self.spatial_index = None
+
+        # Découpage de la pièce en triangles pour placer les caméras, construit à la première utilisation
+        self.placement_sampler = None
+
+        # Grilles à d'autres résolutions (pas -> Room), voir at_sample_step
+        self.levels = {}
+
+    def fingerprint(self):
+        """
+        Identifiant stable de la pièce (coins, trous, pas d'échantillonnage et tuilage).
+        Deux Room construites avec les mêmes paramètres ont la même empreinte :
+        sert de clé pour les caches de couverture.
+        """
+        return Room.plan_fingerprint(self.corners, self.sample_step, self.holes, self.tile_size)
+
+    @staticmethod
+    def plan_fingerprint(corners, sample_step=1.0, holes=None, tile_size=None):
+        """ Empreinte d'un plan sans construire la Room (même valeur que fingerprint) """
+        h = hashlib.sha1()
+        h.update(np.ascontiguousarray(corners, dtype=float).tobytes())
+        for hole in holes or []:
+            h.update(b"hole")
+            h.update(np.ascontiguousarray(hole, dtype=float).tobytes())
+        h.update(repr(float(sample_step)).encode())
+        if tile_size is not None:
+            h.update(repr(float(tile_size)).encode())
+        return h.hexdigest()
+
+    def rings(self):
+        """ Contours de la pièce : le polygone extérieur puis les trous """
+        return [self.corners] + self.holes
+
+    def walls(self):
+        """
+        Murs de la pièce sous forme de segments (tableau (n, 2, 2)) : les côtés du polygone
+        et ceux des trous. Sert au calcul d'occlusion (voir LineOfSight.py).
+        """
+        rings = [ring.astype(float) for ring in self.rings()]
+        return np.concatenate([np.stack([ring, np.roll(ring, -1, axis=0)], axis=1) for ring in rings])
 
     def is_point_inside(self, point):
         """
         Algorithme "Ray Casting" pour vérifier si un point (x,y) est dans le polygone.
+        Les arêtes des trous comptent aussi (règle pair-impair) : un point dans un trou est dehors.
         Retourne True si le point est dedans, False sinon.
         """
+        profiling.count('point_in_polygon')
         x, y = point
-        n = len(self.corners)
         inside = False
-        p1x, p1y = self.corners[0]
-        for i in range(n + 1):
-            p2x, p2y = self.corners[i % n]
-            if y > min(p1y, p2y):
-                if y <= max(p1y, p2y):
-                    if x <= max(p1x, p2x):
-                        if p1y != p2y:
-                            xinters = (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
-                        if p1x == p2x or x <= xinters:
-                            inside = not inside
-            p1y, p2y = p2x, p2y # Correction ici: il faut mettre à jour p1 pour le tour suivant
-            p1x, p1y = p2x, p2y # La bonne mise à jour des variables
+        for corners in self.rings():
+            n = len(corners)
+            p1x, p1y = corners[0]
+            for i in range(n + 1):
+                p2x, p2y = corners[i % n]
+                if y > min(p1y, p2y):
+                    if y <= max(p1y, p2y):
+                        if x <= max(p1x, p2x):
+                            if p1y != p2y:
+                                xinters = (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
+                            if p1x == p2x or x <= xinters:
+                                inside = not inside
+                p1y, p2y = p2x, p2y # Correction ici: il faut mettre à jour p1 pour le tour suivant
+                p1x, p1y = p2x, p2y # La bonne mise à jour des variables
 
         return inside
     
+    def are_points_inside(self, points, chunk_size=None):
+        """
+        Version "par lot" de is_point_inside : classe un tableau de points (n, 2) d'un coup.
+        Même règle de Ray Casting, vectorisée à la fois sur les points et sur les arêtes
+        (tableau points x arêtes, par paquets de chunk_size points pour borner la mémoire ;
+        par défaut MAX_POINT_EDGE_PAIRS divisé par le nombre d'arêtes, trous compris).
+        Retourne un tableau booléen (n,).
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        profiling.count('point_in_polygon', len(points))
+        # Arêtes du polygone et des trous (règle pair-impair)
+        walls = self.walls()
+        p1, p2 = walls[:, 0], walls[:, 1]
+
+        # Les arêtes horizontales ne sont jamais croisées (même comportement que is_point_inside)
+        keep = p1[:, 1] != p2[:, 1]
+        p1x, p1y = p1[keep, 0], p1[keep, 1]
+        p2x, p2y = p2[keep, 0], p2[keep, 1]
+        y_min, y_max = np.minimum(p1y, p2y), np.maximum(p1y, p2y)
+        x_max = np.maximum(p1x, p2x)
+        vertical = p1x == p2x
+        if chunk_size is None:
+            chunk_size = max(1, MAX_POINT_EDGE_PAIRS // max(len(p1x), 1))
+
+        inside = np.zeros(len(points), dtype=bool)
+        for start in range(0, len(points), chunk_size):
+            x = points[start:start + chunk_size, 0:1]
+            y = points[start:start + chunk_size, 1:2]
+            xinters = (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
+            crossing = (y > y_min) & (y <= y_max) & (x <= x_max) & (vertical | (x <= xinters))
+            inside[start:start + chunk_size] = np.count_nonzero(crossing, axis=1) % 2 == 1
+        return inside
+
+    def random_points_inside(self, count, rng=None):
+        """
+        Tire count points uniformément dans la pièce, d'un seul coup et sans rejet :
+        triangle choisi selon son aire puis point uniforme dans le triangle (voir PlacementSampler.py).
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        return self.get_placement_sampler().sample(count, rng)
+
+    def get_placement_sampler(self):
+        """
+        Découpage de la pièce (trous compris) en triangles pondérés par leur aire, construit une
+        seule fois : sert au placement initial des caméras et à borner les mutations (voir clip_moves).
+        """
+        if self.placement_sampler is None:
+            self.placement_sampler = PlacementSampler(self.walls())
+        return self.placement_sampler
+
+    def clip_moves(self, origins, targets):
+        """
+        Déplace des caméras de origins vers targets (tableaux (n, 2), origines dans la pièce) :
+        un déplacement qui sort de la pièce s'arrête juste avant le premier mur traversé,
+        au lieu d'être annulé. Si le point obtenu est encore dehors (origine posée sur un mur),
+        la caméra reste à son origine. Retourne les nouvelles positions (n, 2).
+        """
+        origins = np.asarray(origins, dtype=float).reshape(-1, 2)
+        positions = np.asarray(targets, dtype=float).reshape(-1, 2).copy()
+        outside = ~self.are_points_inside(positions)
+        profiling.count('clipped_moves', np.count_nonzero(outside))
+        if np.any(outside):
+            clipped = self.get_placement_sampler().clip_moves(origins[outside], positions[outside])
+            still_outside = ~self.are_points_inside(clipped)
+            profiling.count('mutation_rejections', np.count_nonzero(still_outside))
+            clipped[still_outside] = origins[outside][still_outside]
+            positions[outside] = clipped
+        return positions
+
     def generate_sample_points(self, step=1.0):
         """
         Génère une grille de points fixes à l'intérieur de la pièce.
         step: l'espacement entre les points (plus c'est petit, plus c'est précis, mais plus c'est lent).
+        Toute la grille est construite puis filtrée d'un coup avec are_points_inside.
         """
-        points = []
         # On parcourt la "bounding box" de la pièce
         min_x, max_x, min_y, max_y = self.bounds
         
         # arange permet de créer des séquences de nombres avec un pas décimal
         x_range = np.arange(min_x, max_x, step)
         y_range = np.arange(min_y, max_y, step)
-        
-        for x in x_range:
-            for y in y_range:
-                # On ajoute le point seulement s'il est vraiment DANS la pièce
-                # On ajoute un petit décalage (step/2) pour centrer le point dans sa case virtuelle
-                p = (x + step/2, y + step/2)
-                if self.is_point_inside(p):
-                    points.append(p)
-                    
-        return np.array(points)
+
+        # On ajoute un petit décalage (step/2) pour centrer le point dans sa case virtuelle
+        # indexing="ij" garde l'ordre d'origine (x puis y)
+        grid_x, grid_y = np.meshgrid(x_range + step/2, y_range + step/2, indexing="ij")
+        grid = np.column_stack([grid_x.ravel(), grid_y.ravel()])
+
+        # On garde seulement les points vraiment DANS la pièce
+        return grid[self.are_points_inside(grid)]
+
+    def at_sample_step(self, step):
+        """
+        Même pièce, échantillonnée avec un autre pas (grille plus grossière ou plus fine).
+        Si step est un multiple entier k de sample_step (sans tuiles), la grille grossière est
+        extraite de sample_points : un point sur k dans chaque direction, donc un sous-ensemble
+        de la grille fine. Sinon (pas non multiple, pas plus fin, pièce en tuiles) c'est une grille
+        indépendante, dont les points ne sont en général pas ceux de la grille fine.
+        Chaque niveau n'est calculé qu'une fois puis gardé en mémoire.
+        """
+        if step == self.sample_step:
+            return self
+        if step not in self.levels:
+            level = copy.copy(self)
+            level.sample_step = step
+            ratio = step / self.sample_step
+            k = int(round(ratio))
+            if self.tile_size is None and k > 1 and abs(ratio - k) < 1e-9 * k:
+                level.sample_points = self.subsample_points(k)
+                level.tiles = None
+            elif self.tile_size is None:
+                level.sample_points = self.generate_sample_points(step)
+                level.tiles = None
+            else:
+                level.tiles = SampleTiles(self, step, self.tile_size)
+                level.sample_points = level.tiles.points
+            level.spatial_index = None
+            level.levels = {}
+            self.levels[step] = level
+        return self.levels[step]
+
+    def subsample_points(self, k):
+        """
+        Points de sample_points gardés un sur k dans chaque direction (indices de grille i, j
+        avec i % k == j % k == k // 2, soit le point le plus proche du centre de chaque case k x k).
+        """
+        min_x, _, min_y, _ = self.bounds
+        step = self.sample_step
+        i = np.rint((self.sample_points[:, 0] - min_x - step / 2) / step).astype(np.int64)
+        j = np.rint((self.sample_points[:, 1] - min_y - step / 2) / step).astype(np.int64)
+        return self.sample_points[(i % k == k // 2) & (j % k == k // 2)]
+
+    def build_sample_levels(self, steps=(2.0, 1.0, 0.5)):
+        """
+        Niveaux d'échantillonnage du plus grossier au plus fin (par exemple 2.0 -> 1.0 -> 0.5).
+        Le dernier niveau est toujours la pièce elle-même (pas sample_step) : les pas égaux à
+        sample_step sont ignorés et la pièce est ajoutée à la fin si besoin, pour que la fitness
+        finale porte sur la grille de la pièce. Les niveaux multiples entiers de sample_step
+        sont des sous-ensembles de sa grille (voir at_sample_step).
+        Lève ValueError pour un pas plus fin que sample_step.
+        Retourne la liste des Room correspondantes.
+        """
+        finer = [step for step in steps if step < self.sample_step]
+        if finer:
+            raise ValueError(f"Pas {finer} plus fins que sample_step={self.sample_step} : "
+                             "construire la pièce avec le pas le plus fin.")
+        coarse = [step for step in steps if step > self.sample_step]
+        return [self.at_sample_step(step) for step in coarse] + [self]
+
+    def get_spatial_index(self, cells_per_step=4):
+        """
+        Index spatial (grille de buckets alignée sur sample_step) des points d'échantillonnage.
+        Construit une seule fois puis réutilisé : permet de ne tester que les points
+        à portée d'une caméra.
+        """
+        if self.spatial_index is None:
+            from SpatialIndex import SpatialIndex
+            self.spatial_index = SpatialIndex(self.sample_points, cells_per_step * self.sample_step)
+        return self.spatial_index
+
+    def get_tiles(self, tile_size=None):
+        """
+        Points d'échantillonnage par tuiles (voir SampleTiles.py), pour l'évaluation tuile par tuile.
+        Déjà construits si la pièce a été créée avec tile_size ; sinon construits une seule fois
+        (tuiles de tile_size mètres, par défaut 16 pas d'échantillonnage). Les points sont les mêmes
+        que sample_points, à l'arrondi float32 près, rangés dans un autre ordre.
+        """
+        if self.tiles is None:
+            self.tiles = SampleTiles(self, self.sample_step, tile_size or 16 * self.sample_step)
+        return self.tiles
 
     def plot_room(self, ax):
         """
         Dessine la pièce sur un axe matplotlib donné.
         ax: l'objet 'axes' de matplotlib sur lequel dessiner.
         """
+        # matplotlib n'est importé que pour dessiner : le calcul n'en dépend pas
+        import matplotlib.patches as patches
+
         # Création du polygone
         poly = patches.Polygon(self.corners, closed=True, edgecolor='black', facecolor='#EDEFD0', linewidth=2)
         ax.add_patch(poly)
+        for hole in self.holes:
+            ax.add_patch(patches.Polygon(hole, closed=True, edgecolor='black', facecolor='white', linewidth=2))
         
         # Réglage des limites du graphique pour bien voir toute la pièce + une petite marge
         margin = 1
@@ -90,7 +305,8 @@ class Room:
         ax.set_title("Environment de la pièce")
         ax.grid(True, linestyle='--', alpha=0.6)
 
-    def get_room(self, id_room):
+    @staticmethod
+    def get_room(id_room):
         """
         Retourne une instance de Room prédéfinie selon l'ID.
         id_room: entier identifiant la pièce (1, 2, 3, ...)
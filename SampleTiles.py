@@ -0,0 +1,62 @@
+import numpy as np
+
+
+class SampleTiles:
+    def __init__(self, room, step, tile_size, dtype=np.float32):
+        """
+        Points d'échantillonnage d'une grande pièce, rangés par tuiles carrées de tile_size mètres.
+        La grille est la même que Room.generate_sample_points (pas step, centrée dans chaque case),
+        mais elle est construite et filtrée tuile par tuile : la grille complète de la bounding box
+        n'existe jamais en mémoire. Les points sont stockés en float32 dans un seul tableau contigu,
+        tuile après tuile ; les tuiles vides (hors de la pièce, ou dans un trou) sont ignorées.
+        points : tableau (n, 2), starts : début de chaque tuile dans points (n_tiles + 1),
+        boxes : boîte englobante (min_x, max_x, min_y, max_y) des points de chaque tuile.
+        """
+        self.step = float(step)
+        self.tile_size = float(tile_size)
+        min_x, max_x, min_y, max_y = room.bounds
+        x_range = np.arange(min_x, max_x, step) + step / 2
+        y_range = np.arange(min_y, max_y, step) + step / 2
+        # Nombre de cases de la grille par côté de tuile
+        cells = max(1, int(round(tile_size / step)))
+
+        tiles, boxes = [], []
+        for x0 in range(0, len(x_range), cells):
+            for y0 in range(0, len(y_range), cells):
+                grid_x, grid_y = np.meshgrid(x_range[x0:x0 + cells], y_range[y0:y0 + cells], indexing="ij")
+                grid = np.column_stack([grid_x.ravel(), grid_y.ravel()])
+                inside = grid[room.are_points_inside(grid)]
+                if len(inside) == 0:
+                    continue
+                tile = inside.astype(dtype)
+                tiles.append(tile)
+                boxes.append((tile[:, 0].min(), tile[:, 0].max(), tile[:, 1].min(), tile[:, 1].max()))
+
+        self.points = np.concatenate(tiles) if tiles else np.zeros((0, 2), dtype=dtype)
+        self.starts = np.cumsum([0] + [len(tile) for tile in tiles])
+        self.boxes = np.array(boxes, dtype=float).reshape(-1, 4)
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def tile(self, index):
+        """ Points de la tuile index (vue, sans copie) """
+        return self.points[self.starts[index]:self.starts[index + 1]]
+
+    def near(self, x, y, radius):
+        """
+        Masque (..., n_tiles) des tuiles dont la boîte est à moins de radius des positions (x, y)
+        (tableaux de même forme) : seules ces tuiles peuvent contenir des points vus.
+        """
+        x = np.asarray(x, dtype=float)[..., None]
+        y = np.asarray(y, dtype=float)[..., None]
+        min_x, max_x, min_y, max_y = self.boxes.T
+        dx = np.maximum(np.maximum(min_x - x, x - max_x), 0)
+        dy = np.maximum(np.maximum(min_y - y, y - max_y), 0)
+        # Petite marge : un point exactement à la portée doit rester testé malgré les arrondis
+        reach = radius * (1 + 1e-9)
+        return dx * dx + dy * dy <= reach * reach
+
+    @property
+    def nbytes(self):
+        return self.points.nbytes + self.starts.nbytes + self.boxes.nbytes
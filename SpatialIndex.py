@@ -0,0 +1,79 @@
+import numpy as np
+
+
+class SpatialIndex:
+    def __init__(self, points, cell_size):
+        """
+        Grille de "buckets" uniformes sur les points d'échantillonnage.
+        Les points sont triés par case (ligne par ligne) : les cases d'une même ligne
+        sont contiguës en mémoire, une requête rectangulaire coûte donc une tranche par ligne.
+        points : tableau (n, 2), cell_size : côté d'une case
+        """
+        self.points = np.asarray(points, dtype=float).reshape(-1, 2)
+        self.cell_size = float(cell_size)
+        if len(self.points) == 0:
+            self.origin = np.zeros(2)
+            self.shape = (0, 0)
+            self.order = np.zeros(0, dtype=np.int64)
+            self.cell_start = np.zeros(1, dtype=np.int64)
+            return
+
+        self.origin = self.points.min(axis=0)
+        cells = np.floor((self.points - self.origin) / self.cell_size).astype(np.int64)
+        n_cols = int(cells[:, 0].max()) + 1
+        n_rows = int(cells[:, 1].max()) + 1
+        self.shape = (n_rows, n_cols)
+
+        # Identifiant de case ligne par ligne, puis tri stable (l'ordre d'origine est gardé dans une case)
+        cell_ids = cells[:, 1] * n_cols + cells[:, 0]
+        self.order = np.argsort(cell_ids, kind="stable")
+        # cell_start[c] : premier point (dans self.order) de la case c
+        self.cell_start = np.searchsorted(cell_ids[self.order], np.arange(n_rows * n_cols + 1))
+
+    def query_box(self, min_x, max_x, min_y, max_y):
+        """ Indices des points dont la case touche le rectangle [min_x, max_x] x [min_y, max_y] """
+        n_rows, n_cols = self.shape
+        if n_rows == 0:
+            return np.zeros(0, dtype=np.int64)
+        col0 = max(int(np.floor((min_x - self.origin[0]) / self.cell_size)), 0)
+        col1 = min(int(np.floor((max_x - self.origin[0]) / self.cell_size)), n_cols - 1)
+        row0 = max(int(np.floor((min_y - self.origin[1]) / self.cell_size)), 0)
+        row1 = min(int(np.floor((max_y - self.origin[1]) / self.cell_size)), n_rows - 1)
+        if col0 > col1 or row0 > row1:
+            return np.zeros(0, dtype=np.int64)
+
+        rows = np.arange(row0, row1 + 1) * n_cols
+        starts = self.cell_start[rows + col0]
+        ends = self.cell_start[rows + col1 + 1]
+        slices = [self.order[start:end] for start, end in zip(starts, ends) if end > start]
+        if not slices:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate(slices)
+
+    def query_wedge(self, x, y, orientation, fov, radius):
+        """
+        Indices des points qui peuvent être vus par une caméra (angles en radians) :
+        on interroge la boîte englobante du secteur (cône) et non celle du disque entier.
+        """
+        min_x, max_x, min_y, max_y = wedge_bounds(x, y, orientation, fov, radius)
+        return self.query_box(min_x, max_x, min_y, max_y)
+
+
+def wedge_bounds(x, y, orientation, fov, radius):
+    """
+    Boîte englobante d'un secteur de disque (angles en radians) : centre, extrémités de l'arc
+    et points cardinaux de l'arc compris dans le cône. Une petite marge absorbe les arrondis.
+    """
+    margin = 1e-9 * max(1.0, radius)
+    if fov >= 2 * np.pi:
+        return x - radius - margin, x + radius + margin, y - radius - margin, y + radius + margin
+
+    half = fov / 2
+    angles = [orientation - half, orientation + half]
+    for cardinal in (0.0, np.pi / 2, np.pi, 3 * np.pi / 2):
+        # Le point cardinal est dans le cône si son écart (ramené dans [-pi, pi]) est <= half
+        if abs((cardinal - orientation + np.pi) % (2 * np.pi) - np.pi) <= half:
+            angles.append(cardinal)
+    xs = [x] + [x + radius * np.cos(a) for a in angles]
+    ys = [y] + [y + radius * np.sin(a) for a in angles]
+    return min(xs) - margin, max(xs) + margin, min(ys) - margin, max(ys) + margin
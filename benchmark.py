@@ -0,0 +1,208 @@
+"""
+Benchmarks des chemins critiques (échantillonnage, point dans la pièce, fitness, sélection, GA).
+
+    python benchmark.py run --output bench.json [--quick]
+    python benchmark.py compare baseline.json bench.json [--threshold 0.1]
+
+Les résultats sont écrits en JSON avec un débit par mesure ; le mode compare signale les mesures
+dont le débit a baissé de plus de threshold (10 % par défaut) et sort avec le code 1.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+from types import SimpleNamespace
+import numpy as np
+from Room import Room
+from Individual import Individual
+from utils import (calculate_fitness, run_genetic_algorithm, select_parent,
+                   roulette_wheel_selection, rank_selection)
+from selection import roulette_selection_batch, rank_selection_batch, tournament_selection_batch
+
+# Nombres de points des pièces synthétiques et nombres de caméras testés
+SYNTHETIC_POINTS = (10**4, 10**5, 10**6)
+QUICK_SYNTHETIC_POINTS = (10**4, 10**5)
+CAMERA_COUNTS = (3, 10, 50)
+# Nombre de points testés un par un avec is_point_inside (la version scalaire est lente)
+SCALAR_POINTS = 2000
+SELECTION_PICKS = 1000
+
+
+def synthetic_room(n_points, n_vertices=64, seed=0):
+    """
+    Grand polygone en étoile (non convexe) de n_vertices sommets, dont le pas d'échantillonnage
+    est choisi pour obtenir environ n_points points.
+    """
+    rng = np.random.default_rng(seed)
+    angles = np.linspace(0, 2 * np.pi, n_vertices, endpoint=False)
+    radii = 50 * rng.uniform(0.6, 1.0, n_vertices)
+    corners = np.column_stack([radii * np.cos(angles), radii * np.sin(angles)])
+    x, y = corners[:, 0], corners[:, 1]
+    area = 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+    return Room(corners, sample_step=float(np.sqrt(area / n_points)))
+
+
+def benchmark_rooms(quick=False):
+    """ Les trois pièces prédéfinies (Room.get_room) et les pièces synthétiques """
+    rooms = {f"room_{i}": Room.get_room(i) for i in (1, 2, 3)}
+    for n_points in (QUICK_SYNTHETIC_POINTS if quick else SYNTHETIC_POINTS):
+        rooms[f"synthetic_{n_points}"] = synthetic_room(n_points)
+    return rooms
+
+
+def best_time(function, repeat=3):
+    """ Meilleur temps (secondes) sur repeat appels """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def result(name, room_name, seconds, work, unit, **extra):
+    """ Une mesure : temps et débit (work unités par seconde) """
+    return dict(name=name, room=room_name, seconds=seconds,
+                throughput=work / seconds if seconds > 0 else float('inf'), unit=unit, **extra)
+
+
+def random_individual(room, num_cameras, rng):
+    positions = room.random_points_inside(num_cameras, rng)
+    angles = rng.uniform(0, 360, size=num_cameras)
+    genes = [[float(x), float(y), float(a)] for (x, y), a in zip(positions, angles)]
+    return Individual(room, num_cameras, 90, 12, genes=genes)
+
+
+def room_benchmarks(room_name, room, repeat=3):
+    """ Échantillonnage, point dans la pièce, fitness et une génération du GA sur une pièce """
+    rng = np.random.default_rng(0)
+    n_points = len(room.sample_points)
+    results = []
+
+    seconds = best_time(lambda: room.generate_sample_points(room.sample_step), repeat)
+    results.append(result('generate_sample_points', room_name, seconds, n_points, 'points/s',
+                          n_points=n_points))
+
+    points = room.sample_points[:SCALAR_POINTS]
+    seconds = best_time(lambda: [room.is_point_inside(p) for p in points], repeat)
+    results.append(result('is_point_inside', room_name, seconds, len(points), 'points/s',
+                          n_points=len(points)))
+    seconds = best_time(lambda: room.are_points_inside(room.sample_points), repeat)
+    results.append(result('are_points_inside', room_name, seconds, n_points, 'points/s',
+                          n_points=n_points))
+
+    for num_cameras in CAMERA_COUNTS:
+        individual = random_individual(room, num_cameras, rng)
+        seconds = best_time(lambda: calculate_fitness(room, individual), repeat)
+        results.append(result('calculate_fitness', room_name, seconds, n_points * num_cameras,
+                              'points*cameras/s', n_points=n_points, n_cameras=num_cameras))
+
+        # Une génération complète (évaluation, tri, sélection, croisement, mutation)
+        pop_size = 20
+        seconds = best_time(lambda: run_genetic_algorithm(room, num_cameras, pop_size=pop_size,
+                                                          generations=1, seed=0), repeat)
+        results.append(result('ga_generation', room_name, seconds, 1, 'generations/s',
+                              n_points=n_points, n_cameras=num_cameras, pop_size=pop_size,
+                              points_cameras_per_second=pop_size * n_points * num_cameras / seconds))
+    return results
+
+
+def selection_benchmarks(pop_size=100, repeat=3):
+    """ Opérateurs de sélection : SELECTION_PICKS parents tirés dans une population de pop_size """
+    rng = np.random.default_rng(0)
+    fitness = rng.random(pop_size)
+    population = [SimpleNamespace(fitness=float(value)) for value in fitness]
+
+    operators = {
+        'roulette_wheel_selection': lambda: [roulette_wheel_selection(population) for _ in range(SELECTION_PICKS)],
+        'select_parent': lambda: [select_parent(population) for _ in range(SELECTION_PICKS)],
+        'rank_selection': lambda: [rank_selection(population) for _ in range(SELECTION_PICKS)],
+        'roulette_selection_batch': lambda: roulette_selection_batch(fitness, SELECTION_PICKS, rng),
+        'rank_selection_batch': lambda: rank_selection_batch(fitness, SELECTION_PICKS, rng),
+        'tournament_selection_batch': lambda: tournament_selection_batch(fitness, SELECTION_PICKS, rng),
+    }
+    return [result(name, None, best_time(operator, repeat), SELECTION_PICKS, 'picks/s', pop_size=pop_size)
+            for name, operator in operators.items()]
+
+
+def run_benchmarks(quick=False, repeat=3):
+    """ Toutes les mesures, avec une description de la machine """
+    results = selection_benchmarks(repeat=repeat)
+    for room_name, room in benchmark_rooms(quick).items():
+        results += room_benchmarks(room_name, room, repeat)
+    return {
+        'meta': {
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.platform(),
+            'quick': quick,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def result_key(entry):
+    """ Identifiant d'une mesure, pour apparier deux fichiers de résultats """
+    return (entry['name'], entry['room'], entry.get('n_cameras'))
+
+
+def compare_results(baseline, current, threshold=0.1):
+    """
+    Compare deux résultats de run_benchmarks (mesures appariées par result_key).
+    Retourne la liste (clé, débit de référence, débit actuel, rapport) des régressions :
+    débit actuel inférieur de plus de threshold au débit de référence.
+    """
+    reference = {result_key(entry): entry for entry in baseline['results']}
+    regressions = []
+    for entry in current['results']:
+        key = result_key(entry)
+        if key not in reference:
+            continue
+        ratio = entry['throughput'] / reference[key]['throughput']
+        if ratio < 1 - threshold:
+            regressions.append((key, reference[key]['throughput'], entry['throughput'], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help="exécute les benchmarks")
+    run.add_argument('--output', default='bench_results.json')
+    run.add_argument('--quick', action='store_true', help="sans la pièce synthétique de 10^6 points")
+    run.add_argument('--repeat', type=int, default=3)
+    compare = commands.add_parser('compare', help="compare deux fichiers de résultats")
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+    compare.add_argument('--threshold', type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        results = run_benchmarks(quick=args.quick, repeat=args.repeat)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        for entry in results['results']:
+            print(f"{entry['name']:28s} {str(entry['room']):20s} {str(entry.get('n_cameras', '')):>4s} "
+                  f"{entry['throughput']:14.4g} {entry['unit']}")
+        print(f"Résultats écrits dans {args.output}")
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(args.current, encoding='utf-8') as f:
+        current = json.load(f)
+    regressions = compare_results(baseline, current, args.threshold)
+    for (name, room_name, num_cameras), before, after, ratio in regressions:
+        print(f"RÉGRESSION {name} {room_name} {num_cameras or ''} : "
+              f"{before:.4g} -> {after:.4g} ({(ratio - 1) * 100:+.1f} %)")
+    if not regressions:
+        print("Aucune régression au-delà du seuil.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+import heapq
+import numpy as np
+from Individual import Individual
+from CoverageCache import POPCOUNT_TABLE
+from coverage import genes_visibility
+from utils import new_stats, record_generation
+
+
+def wall_candidates(room, spacing=0.5, orientations=16, inset=0.05):
+    """
+    Poses candidates "murales" : une position tous les spacing mètres le long de chaque mur,
+    décalée de inset vers l'intérieur, combinée avec orientations angles régulièrement espacés.
+    Retourne un tableau de gènes (k, 3) [x, y, angle en degrés].
+    """
+    positions = []
+    for start, end in room.walls():
+        length = np.hypot(*(end - start))
+        if length == 0:
+            continue
+        direction = (end - start) / length
+        normal = np.array([-direction[1], direction[0]])
+        steps = np.arange(spacing / 2, length, spacing)
+        along = start + steps[:, None] * direction
+        # La normale intérieure est celle qui garde le milieu du mur dans la pièce
+        middle = (start + end) / 2
+        if not room.are_points_inside(middle + inset * normal)[0]:
+            normal = -normal
+        positions.append(along + inset * normal)
+
+    positions = np.vstack(positions) if positions else np.empty((0, 2))
+    positions = positions[room.are_points_inside(positions)]
+    angles = np.arange(orientations) * 360.0 / orientations
+    return np.column_stack([
+        np.repeat(positions, len(angles), axis=0),
+        np.tile(angles, len(positions)),
+    ])
+
+
+def coverage_matrix(candidates, fov, radius, room, line_of_sight=None, chunk_size=256):
+    """
+    Matrice de couverture candidats x points, stockée en bitsets (k, n_bytes) (np.packbits).
+    Calculée une seule fois, par paquets de chunk_size candidats.
+    """
+    candidates = np.asarray(candidates, dtype=float).reshape(-1, 3)
+    points = room.sample_points
+    packed = np.empty((len(candidates), (len(points) + 7) // 8), dtype=np.uint8)
+    for start in range(0, len(candidates), chunk_size):
+        chunk = candidates[start:start + chunk_size]
+        visible = genes_visibility(chunk, fov, radius, points)
+        if line_of_sight is not None:
+            visible &= line_of_sight.visible_mask(chunk[:, 0], chunk[:, 1])
+        packed[start:start + chunk_size] = np.packbits(visible, axis=-1)
+    return packed
+
+
+def lazy_greedy_max_coverage(matrix, num_cameras, allowed=None):
+    """
+    Max-coverage glouton "paresseux" : à chaque étape on prend le candidat au plus grand gain
+    marginal (nombre de nouveaux points couverts). Le gain ne peut que diminuer (sous-modularité),
+    donc les anciens gains servent de bornes hautes dans un tas et seuls les candidats en tête
+    sont recalculés. Garantie classique : au moins (1 - 1/e) de l'optimum.
+    matrix : bitsets (k, n_bytes), allowed : indices des candidats autorisés (tous par défaut)
+    Retourne (indices choisis, nombre de points couverts après chaque choix, nombre de gains calculés).
+    """
+    allowed = np.arange(len(matrix)) if allowed is None else np.asarray(allowed)
+    covered = np.zeros(matrix.shape[1], dtype=np.uint8)
+    initial_gains = POPCOUNT_TABLE[matrix[allowed]].sum(axis=1, dtype=np.int64)
+    # heapq est un tas min : on stocke -gain (à gain égal, le plus petit indice d'abord)
+    heap = [(-int(gain), int(index)) for gain, index in zip(initial_gains, allowed)]
+    heapq.heapify(heap)
+
+    chosen, covered_counts = [], []
+    total, gain_evaluations = 0, len(allowed)
+    while heap and len(chosen) < num_cameras:
+        _, index = heapq.heappop(heap)
+        gain = int(POPCOUNT_TABLE[matrix[index] & ~covered].sum())
+        gain_evaluations += 1
+        if not heap or gain >= -heap[0][0]:
+            # Gain à jour et toujours le meilleur : on le prend
+            chosen.append(index)
+            covered |= matrix[index]
+            total += gain
+            covered_counts.append(total)
+        else:
+            heapq.heappush(heap, (-gain, index))
+    return chosen, covered_counts, gain_evaluations
+
+
+def run_greedy_coverage(
+    room,
+    num_cameras: int,
+    fov: float = 90,
+    radius: float = 12,
+    candidates=None,
+    spacing: float = 0.5,
+    orientations: int = 16,
+    line_of_sight=None,
+):
+    """
+    Solveur alternatif à run_genetic_algorithm quand les poses sont limitées à un ensemble fini
+    (par défaut wall_candidates : positions murales tous les spacing mètres x orientations angles).
+    Précalcule la matrice de couverture puis applique le glouton paresseux.
+    Retourne (meilleur Individual, stats) comme run_genetic_algorithm : une "génération" par
+    caméra ajoutée (population réduite à la solution courante).
+    Lève ValueError s'il y a moins de candidats que num_cameras : le résultat aurait moins de
+    caméras que demandé (pour amorcer le GA, greedy_initial_genes complète au hasard).
+    """
+    if candidates is None:
+        candidates = wall_candidates(room, spacing, orientations)
+    candidates = np.asarray(candidates, dtype=float).reshape(-1, 3)
+    if len(candidates) < num_cameras:
+        raise ValueError(f"{len(candidates)} candidats pour {num_cameras} caméras : "
+                         "réduire spacing ou augmenter orientations.")
+    matrix = coverage_matrix(candidates, fov, radius, room, line_of_sight)
+    chosen, covered_counts, gain_evaluations = lazy_greedy_max_coverage(matrix, num_cameras)
+
+    n_points = max(len(room.sample_points), 1)
+    stats = new_stats()
+    for covered in covered_counts:
+        record_generation(stats, np.array([covered / n_points]))
+    stats['candidates'] = len(candidates)
+    stats['gain_evaluations'] = gain_evaluations
+
+    best_individual = Individual(room, len(chosen), fov, radius,
+                                 genes=[list(candidates[i]) for i in chosen])
+    best_individual.set_fitness(covered_counts[-1] / n_points if covered_counts else 0.0)
+    return best_individual, stats
+
+
+def greedy_initial_genes(room, num_cameras, fov, radius, count, candidates=None,
+                         spacing=0.5, orientations=16, keep=0.5, seed=None):
+    """
+    Gènes pour amorcer la génération 0 du GA (paramètre initial_genes de run_genetic_algorithm) :
+    la solution gloutonne, puis des variantes gloutonnes sur un sous-ensemble aléatoire
+    (fraction keep) des candidats, pour garder de la diversité.
+    Retourne un tableau (count, num_cameras, 3).
+    """
+    rng = np.random.default_rng(seed)
+    if candidates is None:
+        candidates = wall_candidates(room, spacing, orientations)
+    candidates = np.asarray(candidates, dtype=float).reshape(-1, 3)
+    matrix = coverage_matrix(candidates, fov, radius, room)
+
+    genes = []
+    for i in range(count):
+        allowed = None
+        if i > 0:
+            allowed = np.flatnonzero(rng.random(len(candidates)) < keep)
+        chosen, _, _ = lazy_greedy_max_coverage(matrix, num_cameras, allowed)
+        # Moins de candidats utiles que de caméras : on complète au hasard parmi les candidats
+        while len(chosen) < num_cameras:
+            chosen.append(int(rng.integers(len(candidates))))
+        genes.append(candidates[chosen])
+    return np.array(genes)
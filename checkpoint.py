@@ -0,0 +1,75 @@
+import json
+import os
+import random
+import numpy as np
+
+# Listes de statistiques par génération, stockées comme tableaux dans le checkpoint
+STATS_ARRAYS = ('best_scores', 'min_scores', 'avg_scores', 'std_scores')
+
+
+def save_checkpoint(path, population, stats, best_individual, rng, meta):
+    """
+    Écrit un checkpoint binaire compact (.npz non compressé) : gènes, fitness, meilleur individu,
+    historique des statistiques, état des générateurs aléatoires et métadonnées (meta, JSON).
+    L'écriture est atomique : fichier temporaire dans le même dossier, puis os.replace ;
+    un checkpoint interrompu ne remplace jamais le précédent.
+    """
+    meta = dict(meta)
+    meta['rng_state'] = rng.bit_generator.state
+    meta['random_state'] = random.getstate()
+    meta['stats_extra'] = {key: value for key, value in stats.items() if key not in STATS_ARRAYS}
+
+    arrays = {
+        'genes': population.genes,
+        'fitness': population.fitness,
+        'best_genes': np.asarray(best_individual.genes if best_individual is not None else [], dtype=float),
+        'meta': np.array(json.dumps(meta)),
+    }
+    for key in STATS_ARRAYS:
+        arrays[key] = np.asarray(stats[key], dtype=float)
+    # Évaluation incrémentale : caméras dont la couverture reste à calculer
+    if population.tracks_coverage:
+        arrays['dirty'] = population.dirty
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path):
+    """
+    Relit un checkpoint écrit par save_checkpoint.
+    Retourne (genes, fitness, best_genes, stats, meta) ; les générateurs aléatoires sont à
+    restaurer avec restore_rng. meta['dirty'] : masque des caméras à recalculer (évaluation
+    incrémentale), None sinon.
+    """
+    with np.load(path) as data:
+        meta = json.loads(str(data['meta']))
+        stats = {key: [float(v) for v in data[key]] for key in STATS_ARRAYS}
+        stats.update(meta.pop('stats_extra'))
+        meta['dirty'] = data['dirty'] if 'dirty' in data else None
+        return data['genes'], data['fitness'], data['best_genes'], stats, meta
+
+
+def check_parameters(meta, parameters):
+    """
+    Vérifie qu'un checkpoint a été écrit avec les mêmes paramètres d'exécution (meta['parameters'],
+    absent des anciens checkpoints) ; lève ValueError sinon.
+    """
+    saved = meta.get('parameters', {})
+    mismatches = [f"{key} ({saved[key]!r} dans le checkpoint, {value!r} demandé)"
+                  for key, value in parameters.items() if key in saved and saved[key] != value]
+    if mismatches:
+        raise ValueError("Le checkpoint ne correspond pas à cette exécution : " + ", ".join(mismatches))
+
+
+def restore_rng(meta):
+    """ Recrée le générateur numpy et remet le module random dans l'état du checkpoint """
+    rng = np.random.default_rng()
+    rng.bit_generator.state = meta['rng_state']
+    version, internal_state, gauss_next = meta['random_state']
+    random.setstate((version, tuple(internal_state), gauss_next))
+    return rng
@@ -0,0 +1,240 @@
+import numpy as np
+import profiling
+from Camera import normalize_angle
+
+# Tolérance relative autour de la frontière du cône : dans cette bande le test
+# par produit scalaire peut différer de arctan2 à cause des arrondis, on
+# recalcule donc ces (rares) points avec la formule exacte de Camera.
+BOUNDARY_TOLERANCE = 1e-9
+
+
+def cameras_to_arrays(cameras):
+    """
+    Convertit une liste de Camera en tableaux numpy (x, y, orientation, fov, radius).
+    Les angles restent en radians, comme dans Camera.
+    """
+    x = np.array([cam.x for cam in cameras], dtype=float)
+    y = np.array([cam.y for cam in cameras], dtype=float)
+    orientation = np.array([cam.orientation for cam in cameras], dtype=float)
+    fov = np.array([cam.fov for cam in cameras], dtype=float)
+    radius = np.array([cam.radius for cam in cameras], dtype=float)
+    return x, y, orientation, fov, radius
+
+
+def visibility_kernel(x, y, orientation, fov, radius, points):
+    """
+    Noyau vectorisé : teste toutes les caméras contre tous les points d'un coup.
+    x, y, orientation, fov, radius : tableaux de forme (..., n_cams) (radians)
+    points : tableau (n_points, 2)
+    Retourne un tableau booléen (..., n_cams, n_points).
+
+    Au lieu de arctan2, on compare le produit scalaire entre la direction de la
+    caméra et le vecteur caméra->point à |d| * cos(fov/2).
+    Le résultat est identique à Camera.is_point_visible.
+    """
+    points = np.asarray(points, dtype=float)
+    x = np.asarray(x, dtype=float)[..., None]
+    y = np.asarray(y, dtype=float)[..., None]
+    orientation = np.asarray(orientation, dtype=float)[..., None]
+    half_fov = np.asarray(fov, dtype=float)[..., None] / 2
+    radius = np.asarray(radius, dtype=float)[..., None]
+
+    dx = points[:, 0] - x
+    dy = points[:, 1] - y
+
+    # 1. Distance (même formule que Camera pour avoir exactement les mêmes arrondis)
+    dist_sq = dx*dx + dy*dy
+    in_range = dist_sq <= radius*radius
+
+    # 2. Angle : produit scalaire avec la direction de visée
+    dot = dx*np.cos(orientation) + dy*np.sin(orientation)
+    dist = np.sqrt(dist_sq)
+    margin = dot - dist*np.cos(half_fov)
+    visible = in_range & (margin >= 0)
+
+    # Points ambigus (sur le bord du cône ou confondus avec la caméra) :
+    # on applique la formule exacte de Camera.is_point_visible
+    ambiguous = in_range & (np.abs(margin) <= BOUNDARY_TOLERANCE * np.maximum(dist, 1.0))
+    if np.any(ambiguous):
+        idx = np.nonzero(ambiguous)
+        angle_to_point = np.arctan2(dy[idx], dx[idx])
+        orient = np.broadcast_to(orientation, dx.shape)[idx]
+        half = np.broadcast_to(half_fov, dx.shape)[idx]
+        angle_diff = normalize_angle(angle_to_point - orient)
+        visible[idx] = np.abs(angle_diff) <= half
+
+    profiling.count('visibility_tests', visible.size)
+    return visible
+
+
+def visibility_matrix(cameras, points):
+    """
+    Matrice de visibilité (n_cams, n_points) pour une liste de Camera.
+    """
+    if len(cameras) == 0:
+        return np.zeros((0, len(points)), dtype=bool)
+    return visibility_kernel(*cameras_to_arrays(cameras), points)
+
+
+def genes_to_arrays(genes, fov, radius):
+    """
+    Comme cameras_to_arrays, à partir des gènes [x, y, angle en degrés] (tableau (..., n_cams, 3)) :
+    tableaux (x, y, orientation, fov, radius) de forme (..., n_cams), angles en radians.
+    """
+    genes = np.asarray(genes, dtype=float)
+    orientation = np.radians(genes[..., 2])
+    fov_rad = np.full(orientation.shape, np.radians(fov))
+    radius_arr = np.full(orientation.shape, float(radius))
+    return genes[..., 0], genes[..., 1], orientation, fov_rad, radius_arr
+
+
+def genes_visibility(genes, fov, radius, points):
+    """
+    Matrice de visibilité directement à partir des gènes [x, y, angle] (angle en degrés),
+    sans créer d'objets Camera.
+    genes : tableau (..., n_cams, 3)
+    fov : angle de vue en degrés, radius : portée
+    """
+    return visibility_kernel(*genes_to_arrays(genes, fov, radius), points)
+
+
+def visibility_chunks(camera_arrays, points, chunk_size=4096, line_of_sight=None):
+    """
+    Visibilité par paquets de chunk_size points, pour borner la mémoire.
+    camera_arrays : (x, y, orientation, fov, radius) de forme (..., n_cams), voir cameras_to_arrays
+    et genes_to_arrays. Produit (start, visible) avec visible de forme (..., n_cams, taille du paquet)
+    pour les points [start, start + taille du paquet).
+    line_of_sight : LineOfSightTable optionnelle ; les bitsets des caméras sont construits une seule
+    fois et les paquets restent alignés sur leurs octets.
+    """
+    packed = None
+    if line_of_sight is not None:
+        chunk_size = max(8, chunk_size - chunk_size % 8)
+        packed = line_of_sight.packed_rows(camera_arrays[0], camera_arrays[1])
+    for start in range(0, len(points), chunk_size):
+        chunk = points[start:start + chunk_size]
+        visible = visibility_kernel(*camera_arrays, chunk)
+        if packed is not None:
+            visible &= line_of_sight.unpack_rows(packed, start, start + len(chunk))
+        yield start, visible
+
+
+def coverage_fraction(visibility):
+    """
+    Fraction des points vus par au moins une caméra.
+    visibility : tableau booléen (..., n_cams, n_points)
+    """
+    n_points = visibility.shape[-1]
+    if n_points == 0:
+        return np.zeros(visibility.shape[:-2]) if visibility.ndim > 2 else 0.0
+    covered = np.any(visibility, axis=-2)
+    return np.count_nonzero(covered, axis=-1) / n_points
+
+
+def population_coverage(genes, fov, radius, points, chunk_size=4096, line_of_sight=None):
+    """
+    Évalue toute une population en un seul calcul vectorisé.
+    genes : tableau (pop, n_cams, 3) avec [x, y, angle en degrés]
+    Retourne un tableau (pop,) de fractions couvertes.
+    Les points sont traités par paquets de chunk_size pour borner la mémoire
+    (tableau intermédiaire de taille pop * n_cams * chunk_size).
+    line_of_sight : LineOfSightTable optionnelle, les points cachés par un mur ne comptent pas.
+    """
+    genes = np.asarray(genes, dtype=float)
+    points = np.asarray(points, dtype=float)
+    n_points = len(points)
+    if n_points == 0:
+        return np.zeros(genes.shape[0])
+
+    covered_count = np.zeros(genes.shape[0], dtype=np.int64)
+    for _, visible in visibility_chunks(genes_to_arrays(genes, fov, radius), points, chunk_size, line_of_sight):
+        # visible : (pop, n_cams, taille du paquet)
+        covered_count += np.count_nonzero(np.any(visible, axis=1), axis=-1)
+
+    return covered_count / n_points
+
+
+def coverage_counts(genes, fov, radius, points):
+    """
+    Nombre de caméras qui voient chaque point, pour un individu (genes : (n_cams, 3)).
+    Sert de base à l'évaluation incrémentale (voir update_coverage_counts).
+    """
+    genes = np.asarray(genes, dtype=float).reshape(-1, 3)
+    return np.count_nonzero(genes_visibility(genes, fov, radius, points), axis=0).astype(np.int32)
+
+
+def update_coverage_counts(counts, old_genes, new_genes, fov, radius, points):
+    """
+    Mise à jour incrémentale des compteurs après le déplacement de quelques caméras :
+    on retire la couverture des anciennes positions et on ajoute celle des nouvelles.
+    Seules les caméras déplacées sont recalculées.
+    """
+    old_genes = np.asarray(old_genes, dtype=float).reshape(-1, 3)
+    new_genes = np.asarray(new_genes, dtype=float).reshape(-1, 3)
+    if len(old_genes) == 0 and len(new_genes) == 0:
+        return counts
+    counts = counts - np.count_nonzero(genes_visibility(old_genes, fov, radius, points), axis=0)
+    return counts + np.count_nonzero(genes_visibility(new_genes, fov, radius, points), axis=0)
+
+
+def counts_fraction(counts):
+    """ Fraction des points vus par au moins une caméra, à partir des compteurs """
+    if len(counts) == 0:
+        return 0.0
+    return np.count_nonzero(counts) / len(counts)
+
+
+def indexed_population_coverage(genes, fov, radius, points, spatial_index):
+    """
+    Comme population_coverage, mais chaque caméra n'est testée que sur les points
+    de la boîte englobante de son cône (requête dans un SpatialIndex).
+    Le coût devient proportionnel au nombre de points à portée et non au nombre total.
+    Le résultat est identique (même noyau de visibilité).
+    """
+    genes = np.asarray(genes, dtype=float)
+    points = np.asarray(points, dtype=float)
+    n_points = len(points)
+    fitness = np.zeros(genes.shape[0])
+    if n_points == 0:
+        return fitness
+
+    fov_rad = np.radians(fov)
+    for i, individual in enumerate(genes):
+        seen = []
+        for x, y, angle in individual:
+            candidates = spatial_index.query_wedge(x, y, np.radians(angle), fov_rad, radius)
+            if len(candidates) == 0:
+                continue
+            visible = genes_visibility([x, y, angle], fov, radius, points[candidates])
+            seen.append(candidates[visible])
+        if seen:
+            fitness[i] = len(np.unique(np.concatenate(seen))) / n_points
+    return fitness
+
+
+def tiled_population_coverage(genes, fov, radius, tiles, chunk_size=4096):
+    """
+    Comme population_coverage, mais tuile par tuile (voir SampleTiles) : pour chaque tuile, seules
+    les caméras dont la portée touche la boîte de la tuile sont testées, et seulement sur ses points.
+    Les tuiles hors de portée de toutes les caméras ne sont jamais lues. Les points float32 d'une
+    tuile sont convertis par paquets de chunk_size, la mémoire reste bornée même avec des millions de points.
+    """
+    genes = np.asarray(genes, dtype=float)
+    n_points = len(tiles.points)
+    covered_count = np.zeros(genes.shape[0], dtype=np.int64)
+    if n_points == 0 or genes.shape[0] == 0:
+        return covered_count / max(n_points, 1)
+
+    near = tiles.near(genes[..., 0], genes[..., 1], radius)  # (pop, n_cams, n_tiles)
+    for tile in np.flatnonzero(np.any(near, axis=(0, 1))):
+        # Couples (individu, caméra) à portée de la tuile, groupés par individu
+        rows, cams = np.nonzero(near[..., tile])
+        cameras = genes[rows, cams]
+        starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+        points = tiles.tile(tile)
+        for start in range(0, len(points), chunk_size):
+            visible = genes_visibility(cameras, fov, radius, points[start:start + chunk_size])
+            seen = np.logical_or.reduceat(visible, starts, axis=0)  # (individus, paquet)
+            covered_count[rows[starts]] += np.count_nonzero(seen, axis=1)
+
+    return covered_count / n_points
@@ -0,0 +1,58 @@
+import json
+from Room import Room
+
+
+def clean_ring(ring):
+    """ Contour [(x, y), ...] sans le point de fermeture répété (GeoJSON ferme ses anneaux) """
+    points = [(float(point[0]), float(point[1])) for point in ring]
+    if len(points) > 1 and points[0] == points[-1]:
+        points = points[:-1]
+    if len(points) < 3:
+        raise ValueError("Un contour de plan doit avoir au moins 3 sommets.")
+    return points
+
+
+def parse_floor_plan(data):
+    """
+    Lit la géométrie d'un plan (dictionnaire JSON). Formats acceptés :
+    - {"corners": [[x, y], ...], "holes": [[[x, y], ...], ...], "sample_step": 0.5}
+    - GeoJSON : Polygon, Feature ou FeatureCollection (premier polygone) ; le premier anneau
+      est le contour de la pièce, les suivants sont les trous. sample_step peut être donné
+      dans les "properties" de la Feature.
+    Retourne (corners, holes, properties).
+    """
+    properties = {}
+    if 'type' not in data:
+        return clean_ring(data['corners']), [clean_ring(hole) for hole in data.get('holes', [])], data
+
+    if data['type'] == 'FeatureCollection':
+        polygons = [feature for feature in data['features']
+                    if feature.get('geometry', {}).get('type') == 'Polygon']
+        if not polygons:
+            raise ValueError("Aucun polygone dans la FeatureCollection.")
+        data = polygons[0]
+    if data['type'] == 'Feature':
+        properties = data.get('properties') or {}
+        data = data['geometry']
+    if data['type'] != 'Polygon':
+        raise ValueError(f"Géométrie non prise en charge : {data['type']} (seul Polygon est accepté).")
+
+    rings = data['coordinates']
+    return clean_ring(rings[0]), [clean_ring(hole) for hole in rings[1:]], properties
+
+
+def load_floor_plan(path, sample_step=None, tile_size=None):
+    """
+    Charge un plan depuis un fichier JSON/GeoJSON (voir parse_floor_plan) et retourne une Room.
+    sample_step : pas d'échantillonnage (par défaut celui du fichier, sinon 1.0)
+    tile_size : pour les grands sites, points stockés par tuiles en float32 (voir SampleTiles.py),
+    à combiner avec evaluation="tiled" dans run_genetic_algorithm.
+    """
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    corners, holes, properties = parse_floor_plan(data)
+    if sample_step is None:
+        sample_step = float(properties.get('sample_step', 1.0))
+    if tile_size is None and properties.get('tile_size') is not None:
+        tile_size = float(properties['tile_size'])
+    return Room(corners, sample_step=sample_step, holes=holes, tile_size=tile_size)
@@ -0,0 +1,205 @@
+import multiprocessing
+import queue
+import random
+import time
+import numpy as np
+from Individual import Individual
+from Population import Population
+from CoverageCache import CoverageCache
+from utils import (new_stats, record_generation, as_batch_selection,
+                   roulette_wheel_selection, select_parent, rank_selection)
+
+# Opérateur de sélection utilisé par chaque île (en boucle si plus d'îles que d'opérateurs)
+DEFAULT_SELECTIONS = [roulette_wheel_selection, select_parent, rank_selection]
+
+
+def migration_targets(island, islands, topology):
+    """ Îles vers lesquelles island envoie ses migrants """
+    if islands < 2:
+        return []
+    if topology == "ring":
+        return [(island + 1) % islands]
+    if topology == "full":
+        return [other for other in range(islands) if other != island]
+    raise ValueError("Topologie inconnue. Veuillez choisir entre 'ring' et 'full'.")
+
+
+def island_worker(island, room, params, selection, seed, inboxes, results, stop):
+    """
+    Boucle génétique d'une île (exécutée dans son propre processus).
+    Tous les migration_interval générations, les migrants (meilleurs individus) partent
+    vers les îles voisines et remplacent les pires individus de l'île qui les reçoit.
+    Avec une échéance (params['deadline'], horloge time.time), la première île qui la dépasse
+    lève stop et toutes les îles s'arrêtent à leur génération suivante (ou pendant l'attente
+    des migrants).
+    """
+    seed_sequence, python_seed = seed
+    # Les opérateurs de utils passent par leurs versions par lot (générateur numpy rng) ;
+    # seul un opérateur personnalisé appelé parent par parent peut utiliser le module random
+    random.seed(python_seed)
+    rng = np.random.default_rng(seed_sequence)
+    selection = as_batch_selection(selection)
+
+    islands = len(inboxes)
+    targets = migration_targets(island, islands, params['topology'])
+    senders = sum(island in migration_targets(other, islands, params['topology'])
+                  for other in range(islands))
+    cache = None
+    if params['evaluation'] == "cache":
+        cache = CoverageCache(room, params['fov'], params['radius'], max_bytes=params['cache_bytes'])
+
+    population = Population.random(room, params['num_cameras'], params['fov'], params['radius'],
+                                   params['pop_size'], rng=rng)
+    stats = new_stats()
+    best_genes, best_fitness = None, -1.0
+
+    for generation in range(params['generations']):
+        if generation > 0 and (stop.is_set() or (params['deadline'] is not None
+                                                 and time.time() >= params['deadline'])):
+            stop.set()
+            break
+
+        # A. Évaluation et tri
+        population.evaluate(chunk_size=params['chunk_size'], cache=cache)
+        population.sort()
+
+        # Migration : on envoie nos meilleurs, on reçoit ceux des voisins
+        if generation > 0 and generation % params['migration_interval'] == 0 and targets:
+            migrants = params['migrants']
+            for target in targets:
+                inboxes[target].put((population.genes[:migrants].copy(), population.fitness[:migrants].copy()))
+            received = 0
+            while received < senders and not stop.is_set():
+                try:
+                    genes, fitness = inboxes[island].get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                population.replace_worst(genes, fitness)
+                population.sort()
+                received += 1
+
+        if population.fitness[0] > best_fitness:
+            best_fitness = float(population.fitness[0])
+            best_genes = population.genes[0].copy()
+        record_generation(stats, population.fitness)
+
+        # C. Nouvelle génération
+        population = population.next_generation(params['pop_size'] // 2, params['mutation_rate'],
+                                                params['mutation_strength'], selection=selection)
+
+    if stop.is_set():
+        # Des migrants peuvent rester non lus : ils ne doivent pas bloquer la fin du processus
+        for inbox in inboxes:
+            inbox.cancel_join_thread()
+    results.put((island, best_genes, best_fitness, stats))
+
+
+def merge_island_stats(island_stats):
+    """
+    Fusionne les statistiques des îles au format de run_genetic_algorithm :
+    max des meilleurs, min des minimums, moyenne des moyennes et écart-type global.
+    Après un arrêt sur budget de temps, les îles n'ont pas forcément fait le même nombre de
+    générations : seules les générations faites par toutes les îles sont fusionnées.
+    """
+    length = min(len(s['best_scores']) for s in island_stats)
+    best = np.array([s['best_scores'][:length] for s in island_stats])
+    low = np.array([s['min_scores'][:length] for s in island_stats])
+    avg = np.array([s['avg_scores'][:length] for s in island_stats])
+    std = np.array([s['std_scores'][:length] for s in island_stats])
+    global_avg = avg.mean(axis=0)
+    # Variance totale = moyenne des (variance + moyenne²) - moyenne globale²
+    global_var = np.maximum((std**2 + avg**2).mean(axis=0) - global_avg**2, 0.0)
+    return {
+        'best_scores': [float(v) for v in best.max(axis=0)],
+        'min_scores': [float(v) for v in low.min(axis=0)],
+        'avg_scores': list(global_avg),
+        'std_scores': list(np.sqrt(global_var)),
+    }
+
+
+def run_island_model(
+    room,
+    num_cameras: int,
+    islands: int = 4,
+    pop_size: int = 20,
+    generations: int = 30,
+    fov: float = 90,
+    radius: float = 12,
+    mutation_rate: float = 0.2,
+    mutation_strength: float = 1.5,
+    migration_interval: int = 10,
+    migrants: int = 2,
+    topology: str = "ring",
+    selections=None,
+    evaluation: str = "batch",
+    chunk_size: int = 4096,
+    cache_bytes: int = 64 * 1024**2,
+    seed=None,
+    time_budget: float = None,
+):
+    """
+    Modèle en îles : plusieurs populations indépendantes évoluent chacune dans un processus.
+    Chaque île peut utiliser un opérateur de sélection différent (selections, par défaut
+    roulette / tournoi / rang en alternance). Toutes les migration_interval générations, chaque
+    île envoie ses `migrants` meilleurs individus à ses voisines (topology "ring" ou "full").
+    time_budget : temps maximal (secondes, démarrage des processus compris) pour l'ensemble des
+    îles ; stats['stop_reason'] vaut alors "time_budget" si l'échéance a arrêté les îles.
+    Retourne le meilleur individu toutes îles confondues et les statistiques fusionnées
+    (même format que run_genetic_algorithm), avec le détail par île dans stats['islands'].
+    """
+    if evaluation not in ("batch", "cache"):
+        raise ValueError("Le modèle en îles accepte evaluation='batch' ou 'cache'.")
+    migration_targets(0, islands, topology)  # validation de la topologie
+    selections = selections or DEFAULT_SELECTIONS
+    island_selections = [selections[i % len(selections)] for i in range(islands)]
+
+    params = {
+        'num_cameras': num_cameras, 'pop_size': pop_size, 'generations': generations,
+        'fov': fov, 'radius': radius, 'mutation_rate': mutation_rate,
+        'mutation_strength': mutation_strength, 'migration_interval': max(1, migration_interval),
+        'migrants': min(migrants, pop_size // 2), 'topology': topology, 'evaluation': evaluation,
+        'chunk_size': chunk_size, 'cache_bytes': cache_bytes,
+        'deadline': time.time() + time_budget if time_budget is not None else None,
+    }
+    seeds = np.random.SeedSequence(seed).spawn(islands)
+
+    inboxes = [multiprocessing.Queue() for _ in range(islands)]
+    results = multiprocessing.Queue()
+    stop = multiprocessing.Event()
+    processes = [
+        multiprocessing.Process(
+            target=island_worker,
+            args=(i, room, params, island_selections[i],
+                  (seeds[i], int(seeds[i].generate_state(1)[0])), inboxes, results, stop),
+        )
+        for i in range(islands)
+    ]
+    for process in processes:
+        process.start()
+    outcomes = []
+    try:
+        while len(outcomes) < islands:
+            try:
+                outcomes.append(results.get(timeout=1.0))
+            except queue.Empty:
+                # Une île qui plante bloquerait les autres à la migration suivante
+                if any(process.exitcode not in (None, 0) for process in processes):
+                    raise RuntimeError("Une île s'est arrêtée avant la fin de l'algorithme.")
+    finally:
+        for process in processes:
+            if len(outcomes) < islands:
+                process.terminate()
+            process.join()
+    outcomes.sort(key=lambda outcome: outcome[0])
+
+    island_stats = [outcome[3] for outcome in outcomes]
+    best_island = max(outcomes, key=lambda outcome: outcome[2])
+    best_individual = Individual(room, num_cameras, fov, radius, genes=best_island[1])
+    best_individual.set_fitness(best_island[2])
+
+    stats = merge_island_stats(island_stats)
+    stats['stop_reason'] = "time_budget" if stop.is_set() else "generations"
+    stats['islands'] = [
+        dict(island_stats[i], selection=island_selections[i].__name__) for i in range(islands)
+    ]
+    return best_individual, stats
@@ -0,0 +1,66 @@
+import numpy as np
+from coverage import genes_visibility
+
+
+def camera_visibility(genes, fov, radius, room, line_of_sight=None):
+    """ Visibilité (k, n_points) d'un lot de caméras (k, 3), murs compris si line_of_sight est fourni """
+    genes = np.asarray(genes, dtype=float).reshape(-1, 3)
+    visible = genes_visibility(genes, fov, radius, room.sample_points)
+    if line_of_sight is not None:
+        visible &= line_of_sight.visible_mask(genes[:, 0], genes[:, 1])
+    return visible
+
+
+def refine(genes, room, fov, radius, step=0.5, angle_step=10.0, min_step=0.05,
+           max_iterations=20, line_of_sight=None):
+    """
+    Recherche locale (pattern search) sur les caméras d'un individu :
+    pour chaque caméra on essaie +/- step sur x et y et +/- angle_step sur l'angle,
+    et on garde le meilleur mouvement s'il améliore la couverture.
+    Quand plus aucune caméra ne progresse, les pas sont divisés par deux.
+    L'évaluation est incrémentale : on garde le nombre de caméras qui voient chaque point,
+    et seule la caméra déplacée est recalculée.
+    Retourne (gènes améliorés, fitness, nombre de caméras recalculées).
+    """
+    genes = np.array(genes, dtype=float).reshape(-1, 3)
+    n_points = len(room.sample_points)
+    if n_points == 0:
+        return genes, 0.0, 0
+
+    visible = camera_visibility(genes, fov, radius, room, line_of_sight)
+    counts = visible.sum(axis=0, dtype=np.int32)
+    covered = np.count_nonzero(counts)
+    camera_evaluations = len(genes)
+
+    for _ in range(max_iterations):
+        improved = False
+        for j in range(len(genes)):
+            moves = np.array([
+                [step, 0, 0], [-step, 0, 0], [0, step, 0], [0, -step, 0],
+                [0, 0, angle_step], [0, 0, -angle_step],
+            ])
+            trials = genes[j] + moves
+            trials = trials[room.are_points_inside(trials[:, :2])]
+            if len(trials) == 0:
+                continue
+
+            # Couverture sans la caméra j, puis avec chacune de ses variantes
+            without = counts - visible[j]
+            trial_visible = camera_visibility(trials, fov, radius, room, line_of_sight)
+            camera_evaluations += len(trials)
+            trial_covered = np.count_nonzero((without > 0) | trial_visible, axis=1)
+
+            best = int(np.argmax(trial_covered))
+            if trial_covered[best] > covered:
+                genes[j] = trials[best]
+                visible[j] = trial_visible[best]
+                counts = without + visible[j]
+                covered = int(trial_covered[best])
+                improved = True
+
+        if not improved:
+            step, angle_step = step / 2, angle_step / 2
+            if step < min_step:
+                break
+
+    return genes, covered / n_points, camera_evaluations
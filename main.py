@@ -1,10 +1,11 @@
 from Camera import Camera
-import matplotlib.pyplot as plt
 from Room import Room
 import numpy as np
 import csv
 import os
-from utils import calculate_fitness, run_genetic_algorithm
+import sys
+from utils import calculate_fitness, iterate_genetic_algorithm
+from render import render_coverage
 
 def main():
     # --- CONFIGURATION DE LA PIÈCE ---
@@ -35,7 +36,7 @@ def main():
     
     # --- EXÉCUTION DE L'ALGORITHME ---
     print("Démarrage de l'algorithme génétique...")
-    best_individual, stats = run_genetic_algorithm(
+    run = iterate_genetic_algorithm(
         room=my_room,
         num_cameras=num_cameras,
         pop_size=pop_size,
@@ -45,6 +46,16 @@ def main():
         mutation_rate=mutation_rate,
         mutation_strength=mutation_strength
     )
+    # Progression affichée au fil de l'eau, toutes les 100 générations
+    while True:
+        try:
+            record = next(run)
+        except StopIteration as stop:
+            best_individual, stats = stop.value
+            break
+        if record['generation'] % 100 == 0:
+            print(f"  Génération {record['generation']} : meilleur {record['best_fitness'] * 100:.2f}% "
+                  f"({record['evaluations']} évaluations, {record['elapsed']:.1f} s)")
     
     # Extraire les statistiques finales
     best_scores = stats['best_scores']
@@ -113,6 +124,17 @@ def main():
     print("=" * 60)
     
     # --- VISUALISATION ---
+    # Carte de couverture rendue sans matplotlib (fonctionne aussi sur un serveur sans écran)
+    render_coverage(my_room, best_individual.genes, fov, radius, "coverage_map.png", scale=10)
+    print("Carte de couverture enregistrée : coverage_map.png")
+
+    # Graphiques matplotlib : toujours enregistrés, la fenêtre n'est ouverte qu'avec --show
+    import matplotlib
+    show = "--show" in sys.argv
+    if not show:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
     
     # Graphique 1 : Évolution de la fitness avec statistiques
@@ -144,7 +166,11 @@ def main():
     ax2.set_title(f'Meilleure configuration ({best_individual.fitness * 100:.2f}% de couverture)')
     
     plt.tight_layout()
-    plt.show()
+    plt.savefig("genetic_algorithm_plot.png", dpi=120)
+    print("Graphiques enregistrés : genetic_algorithm_plot.png")
+    if show:
+        plt.show()
+    plt.close(fig)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
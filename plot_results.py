@@ -1,16 +1,33 @@
 """
 Script pour visualiser les résultats du fichier CSV
 """
+import os
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 
+# Colonnes utilisées par plot_csv_results (les autres ne sont pas chargées)
+PLOT_COLUMNS = ['timestamp', 'num_cameras', 'pop_size', 'generations', 'mutation_rate',
+                'mutation_strength', 'final_max_score', 'final_min_score', 'final_avg_score',
+                'final_std_score']
+
+
+def load_results(path='genetic_algorithm_results.csv', columns=None):
+    """
+    Charge seulement les colonnes demandées d'un fichier de résultats CSV
+    ou d'un dossier de balayage (voir sweep.py, dont on lit l'index).
+    """
+    if os.path.isdir(path):
+        path = os.path.join(path, 'index.csv')
+    return pd.read_csv(path, usecols=columns)
+
+
 def plot_csv_results(csv_file='genetic_algorithm_results.csv'):
     """
-    Charge et affiche les résultats du fichier CSV
+    Charge et affiche les résultats du fichier CSV (ou de l'index d'un dossier de balayage)
     """
     # Charger les données
-    df = pd.read_csv(csv_file)
+    df = load_results(csv_file, PLOT_COLUMNS)
     
     print(f"Nombre total d'exécutions : {len(df)}")
     print("\n" + "="*60)
@@ -93,5 +110,31 @@ def plot_csv_results(csv_file='genetic_algorithm_results.csv'):
                     'mutation_rate', 'final_max_score', 'final_avg_score', 'final_std_score']
     print(df[cols_to_show].to_string(index=False))
 
+
+def plot_sweep_histories(store='sweep_results', group_by='mutation_rate', key='best_scores'):
+    """
+    Courbes moyennes par génération d'un dossier de balayage (voir sweep.py),
+    une courbe par valeur de group_by. Seules les colonnes group_by et history_file
+    de l'index, et le tableau key de chaque exécution, sont chargés.
+    """
+    from sweep import load_histories
+
+    df = load_results(store, [group_by, 'history_file'])
+    fig, ax = plt.subplots(figsize=(10, 6))
+    for value, subset in df.groupby(group_by):
+        histories = [h[key] for h in load_histories(store, subset['history_file'], keys=[key])]
+        # Les exécutions arrêtées plus tôt sont prolongées par leur dernière valeur
+        length = max(len(h) for h in histories)
+        curves = np.array([np.pad(h, (0, length - len(h)), mode='edge') for h in histories]) * 100
+        ax.plot(range(length), curves.mean(axis=0), linewidth=2, label=f'{group_by}={value}')
+    ax.set_xlabel('Génération')
+    ax.set_ylabel('Couverture (%)')
+    ax.set_title(f'Moyenne de {key} par configuration')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    plt.tight_layout()
+    plt.show()
+
+
 if __name__ == "__main__":
     plot_csv_results()
@@ -0,0 +1,109 @@
+import contextlib
+import json
+import time
+
+# Profiler actif (None : instrumentation désactivée, les points de mesure ne font qu'un test)
+ACTIVE = None
+NULL_PHASE = contextlib.nullcontext()
+
+
+def phase(name):
+    """ Mesure la durée du bloc "with" dans le profiler actif (aucun effet sans profiler) """
+    if ACTIVE is None:
+        return NULL_PHASE
+    return ACTIVE.phase(name)
+
+
+def count(name, amount=1):
+    """ Incrémente un compteur du profiler actif (aucun effet sans profiler) """
+    if ACTIVE is not None:
+        ACTIVE.counters[name] = ACTIVE.counters.get(name, 0) + int(amount)
+
+
+class Profiler:
+    def __init__(self, trace=False):
+        """
+        Temps par phase et par génération, et compteurs (évaluations de fitness,
+        tests de visibilité caméra x point, tests point-dans-polygone, mutations bornées par un mur...).
+        Les temps mesurés avant la première génération sont rangés dans "setup".
+        trace : garde aussi chaque intervalle mesuré, pour export_trace.
+        """
+        self.trace = trace
+        self.origin = time.perf_counter()
+        self.setup = {}
+        self.generations = []
+        self.current = self.setup
+        self.counters = {}
+        self.events = []
+
+    def start_generation(self, generation):
+        self.current = {}
+        self.generations.append((generation, self.current))
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.current[name] = self.current.get(name, 0.0) + end - start
+            if self.trace:
+                generation = self.generations[-1][0] if self.generations else None
+                self.events.append((name, start - self.origin, end - start, generation))
+
+    def activate(self):
+        """ Rend ce profiler actif ; retourne le précédent (à remettre avec restore) """
+        global ACTIVE
+        previous, ACTIVE = ACTIVE, self
+        return previous
+
+    @staticmethod
+    def restore(previous):
+        global ACTIVE
+        ACTIVE = previous
+
+    def report(self):
+        """
+        Résumé sérialisable en JSON :
+        - phases : durées par génération, {phase: [secondes, ...]} (0 si la phase n'a pas eu lieu)
+        - totals : durée totale de chaque phase, setup compris
+        - counters : compteurs
+        - events : intervalles (nom, début, durée, génération) si trace=True
+        """
+        names = sorted(set(self.setup).union(*(times for _, times in self.generations)))
+        totals = {name: self.setup.get(name, 0.0) + sum(times.get(name, 0.0) for _, times in self.generations)
+                  for name in names}
+        report = {
+            'generations': [generation for generation, _ in self.generations],
+            'phases': {name: [times.get(name, 0.0) for _, times in self.generations] for name in names},
+            'setup': dict(self.setup),
+            'totals': totals,
+            'counters': dict(self.counters),
+        }
+        if self.trace:
+            report['events'] = list(self.events)
+        return report
+
+
+def export_json(report, path):
+    """ Écrit un rapport (Profiler.report ou stats['profile']) en JSON """
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+
+def export_trace(report, path):
+    """
+    Écrit les intervalles d'un rapport (profiler créé avec trace=True) au format
+    "Trace Event" de Chrome (chrome://tracing, Perfetto), en microsecondes.
+    """
+    events = [
+        {'name': name, 'ph': 'X', 'ts': start * 1e6, 'dur': duration * 1e6, 'pid': 0, 'tid': 0,
+         'args': {'generation': generation}}
+        for name, start, duration, generation in report.get('events', [])
+    ]
+    # Compteurs en fin de trace
+    events.append({'name': 'counters', 'ph': 'C', 'ts': max((e['ts'] + e['dur'] for e in events), default=0),
+                   'pid': 0, 'args': report['counters']})
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
@@ -0,0 +1,137 @@
+"""
+Rendu "headless" de la carte de couverture, sans matplotlib : le nombre de caméras qui voient
+chaque point d'échantillonnage est rasterisé sur la grille de la pièce (un pixel par point)
+puis écrit en PNG (encodeur zlib intégré) ou en NPY.
+"""
+import csv
+import os
+import struct
+import zlib
+import numpy as np
+from coverage import genes_to_arrays, visibility_chunks
+
+# Couleurs (RGB) : hors de la pièce, point non couvert, couvert une fois, couverture maximale
+OUTSIDE_COLOR = (255, 255, 255)
+UNCOVERED_COLOR = (215, 70, 60)
+COVERED_LOW_COLOR = (180, 225, 170)
+COVERED_HIGH_COLOR = (0, 100, 0)
+CAMERA_COLOR = (0, 0, 0)
+
+
+def coverage_point_counts(genes, fov, radius, points, line_of_sight=None, chunk_size=65536):
+    """
+    Nombre de caméras qui voient chaque point (tableau (n_points,)), par paquets de chunk_size
+    points pour borner la mémoire. genes : (n_cams, 3), line_of_sight : LineOfSightTable optionnelle.
+    """
+    genes = np.asarray(genes, dtype=float).reshape(-1, 3)
+    counts = np.zeros(len(points), dtype=np.int32)
+    for start, visible in visibility_chunks(genes_to_arrays(genes, fov, radius), points, chunk_size, line_of_sight):
+        counts[start:start + visible.shape[-1]] = np.count_nonzero(visible, axis=0)
+    return counts
+
+
+def coverage_raster(room, genes, fov, radius, line_of_sight=None):
+    """
+    Carte de couverture (ny, nx) sur la grille d'échantillonnage de la pièce : nombre de caméras
+    qui voient chaque point, -1 hors de la pièce. La ligne 0 est en haut (y maximal), comme une image.
+    """
+    points = room.sample_points
+    counts = coverage_point_counts(genes, fov, radius, points, line_of_sight)
+    return rasterize(room, points, counts)
+
+
+def grid_indices(room, points):
+    """ Indices (ligne, colonne) dans la grille d'échantillonnage des points (x, y) donnés """
+    min_x, max_x, min_y, max_y = room.bounds
+    step = room.sample_step
+    n_rows = max(int(np.ceil((max_y - min_y) / step)), 1)
+    n_cols = max(int(np.ceil((max_x - min_x) / step)), 1)
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    cols = np.clip(np.floor((points[:, 0] - min_x) / step), 0, n_cols - 1).astype(np.int64)
+    rows = np.clip(np.floor((points[:, 1] - min_y) / step), 0, n_rows - 1).astype(np.int64)
+    return n_rows - 1 - rows, cols, (n_rows, n_cols)
+
+
+def rasterize(room, points, values, fill=-1):
+    """ Place des valeurs par point d'échantillonnage sur la grille de la pièce (fill ailleurs) """
+    rows, cols, shape = grid_indices(room, points)
+    raster = np.full(shape, fill, dtype=np.asarray(values).dtype)
+    raster[rows, cols] = values
+    return raster
+
+
+def colorize(raster, max_count=None):
+    """
+    Image RGB (ny, nx, 3) d'une carte de couverture : blanc hors de la pièce, rouge pour les points
+    non couverts, vert de plus en plus foncé avec le nombre de caméras (saturé à max_count).
+    """
+    max_count = max(int(max_count or raster.max()), 1)
+    image = np.empty(raster.shape + (3,), dtype=np.uint8)
+    image[...] = OUTSIDE_COLOR
+    image[raster == 0] = UNCOVERED_COLOR
+    covered = raster > 0
+    if np.any(covered):
+        t = ((np.minimum(raster[covered], max_count) - 1) / max(max_count - 1, 1))[:, None]
+        low, high = np.array(COVERED_LOW_COLOR, dtype=float), np.array(COVERED_HIGH_COLOR, dtype=float)
+        image[covered] = np.round(low + t * (high - low)).astype(np.uint8)
+    return image
+
+
+def write_png(path, image):
+    """ Écrit une image RGB (h, w, 3) uint8 en PNG (sans dépendance externe) """
+    image = np.ascontiguousarray(image, dtype=np.uint8)
+    height, width = image.shape[:2]
+    # Chaque ligne est précédée de son type de filtre (0 : aucun)
+    raw = np.hstack([np.zeros((height, 1), dtype=np.uint8), image.reshape(height, -1)]).tobytes()
+
+    def chunk(tag, data):
+        return (struct.pack('>I', len(data)) + tag + data
+                + struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff))
+
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b'IDAT', zlib.compress(raw, 6)))
+        f.write(chunk(b'IEND', b''))
+
+
+def render_coverage(room, genes, fov, radius, path, scale=1, max_count=None, line_of_sight=None,
+                    show_cameras=True):
+    """
+    Rend la carte de couverture d'une configuration (genes : (n_cams, 3)) dans path :
+    - .npy : la carte brute (coverage_raster)
+    - .png : image colorisée, agrandie scale fois, caméras en noir si show_cameras
+    Retourne la carte.
+    """
+    raster = coverage_raster(room, genes, fov, radius, line_of_sight)
+    if os.path.splitext(path)[1].lower() == '.npy':
+        np.save(path, raster)
+        return raster
+
+    image = colorize(raster, max_count)
+    if show_cameras:
+        genes = np.asarray(genes, dtype=float).reshape(-1, 3)
+        rows, cols, _ = grid_indices(room, genes[:, :2])
+        image[rows, cols] = CAMERA_COLOR
+    if scale > 1:
+        image = np.repeat(np.repeat(image, scale, axis=0), scale, axis=1)
+    write_png(path, image)
+    return raster
+
+
+def render_sweep(room, store, output_dir, extension='.png', **options):
+    """
+    Rend le meilleur individu de chaque exécution d'un dossier de balayage (voir sweep.py) :
+    un fichier <run_id><extension> par exécution dans output_dir. Seules les colonnes utiles
+    de l'index et les gènes de chaque .npz sont lus. Retourne la liste des fichiers écrits.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    with open(os.path.join(store, 'index.csv'), newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            with np.load(os.path.join(store, row['history_file'])) as data:
+                genes = data['best_genes']
+            path = os.path.join(output_dir, f"{int(row['run_id']):06d}{extension}")
+            render_coverage(room, genes, float(row['fov']), float(row['radius']), path, **options)
+            paths.append(path)
+    return paths
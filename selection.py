@@ -0,0 +1,73 @@
+import numpy as np
+
+# Opérateurs de sélection "par lot" : la distribution est préparée une seule fois par
+# génération, puis tous les parents sont tirés d'un coup.
+# Signature commune : operator(fitness, count, rng) -> indices des parents (count,)
+
+
+def alias_table(weights):
+    """
+    Table d'alias de Walker/Vose pour tirer un indice avec probabilité proportionnelle à weights.
+    Construction en O(n), puis chaque tirage coûte O(1).
+    Retourne (prob, alias).
+    """
+    weights = np.asarray(weights, dtype=float)
+    n = len(weights)
+    prob = weights * n / np.sum(weights)
+    alias = np.arange(n)
+    small = list(np.flatnonzero(prob < 1.0))
+    large = list(np.flatnonzero(prob >= 1.0))
+    while small and large:
+        low = small.pop()
+        high = large.pop()
+        alias[low] = high
+        prob[high] -= 1.0 - prob[low]
+        if prob[high] < 1.0:
+            small.append(high)
+        else:
+            large.append(high)
+    # Erreurs d'arrondi : les cases restantes valent exactement 1
+    for i in small + large:
+        prob[i] = 1.0
+    return prob, alias
+
+
+def alias_draw(prob, alias, count, rng):
+    """ count tirages en O(1) chacun dans une table d'alias """
+    columns = rng.integers(0, len(prob), size=count)
+    return np.where(rng.random(count) < prob[columns], columns, alias[columns])
+
+
+def roulette_selection_batch(fitness, count, rng):
+    """
+    Roulette par lot : probabilité proportionnelle à la fitness.
+    Sélection uniforme si la fitness totale est nulle ou négative.
+    """
+    fitness = np.asarray(fitness, dtype=float)
+    if np.sum(fitness) <= 0:
+        return rng.integers(0, len(fitness), size=count)
+    prob, alias = alias_table(np.maximum(fitness, 0.0))
+    return alias_draw(prob, alias, count, rng)
+
+
+def rank_selection_batch(fitness, count, rng):
+    """
+    Sélection par rang, par lot : le meilleur a le poids n, le pire le poids 1.
+    Un seul tri par génération au lieu d'un tri par parent.
+    """
+    fitness = np.asarray(fitness, dtype=float)
+    n = len(fitness)
+    ranked = np.argsort(-fitness, kind="stable")
+    prob, alias = alias_table(np.arange(n, 0, -1))
+    return ranked[alias_draw(prob, alias, count, rng)]
+
+
+def tournament_selection_batch(fitness, count, rng, k=3):
+    """
+    Tournoi par lot : k concurrents par parent, le meilleur gagne.
+    Les concurrents sont tirés avec remise (écart négligeable quand k est petit devant la population).
+    """
+    fitness = np.asarray(fitness, dtype=float)
+    contenders = rng.integers(0, len(fitness), size=(count, k))
+    winners = np.argmax(fitness[contenders], axis=1)
+    return contenders[np.arange(count), winners]
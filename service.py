@@ -0,0 +1,422 @@
+"""
+Service local d'optimisation (HTTP + JSON sur 127.0.0.1, asyncio, sans dépendance externe).
+
+    python service.py --port 8765 --workers 2
+
+- POST /jobs : {"corners": [[x, y], ...], "holes": [...], "sample_step": 0.5, "num_cameras": 3,
+  "fov": 45, "radius": 6, "params": {"generations": 500, "seed": 1, ...}}
+  -> {"job_id": ..., "status": ..., "cached": ...}
+- GET /jobs/<id> : état, et résultat une fois terminé
+- GET /jobs/<id>/events : progression en flux NDJSON (une ligne JSON par mise à jour) jusqu'à la fin
+
+Les jobs sont exécutés par un pool borné de processus (run_genetic_algorithm) ; au-delà de
+max_pending jobs en cours, le service répond 503. Les résultats des requêtes avec une graine
+("seed" dans params, donc reproductibles) sont partagés entre requêtes identiques et gardés dans un
+cache LRU indexé par l'empreinte de la pièce et des paramètres ; chaque worker garde les Room déjà
+construites (grilles d'échantillonnage) pour les jobs suivants sur le même plan. Les jobs terminés
+sont oubliés après job_ttl secondes (ou au-delà de max_jobs), et chaque job ne garde que ses
+max_events dernières mises à jour de progression.
+"""
+import argparse
+import asyncio
+import hashlib
+import inspect
+import json
+import multiprocessing
+import signal
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+import numpy as np
+from Room import Room
+from utils import iterate_genetic_algorithm
+from selection import roulette_selection_batch, rank_selection_batch, tournament_selection_batch
+
+# Opérateurs de sélection accessibles par leur nom dans "params"
+SELECTIONS = {
+    'roulette': roulette_selection_batch,
+    'rank': rank_selection_batch,
+    'tournament': tournament_selection_batch,
+}
+# Paramètres de iterate_genetic_algorithm qui ne peuvent pas venir d'une requête JSON
+EXCLUDED_PARAMS = {'room', 'num_cameras', 'fov', 'radius', 'workers', 'initial_genes', 'profile',
+                   'checkpoint_path', 'resume', 'local_search_options'}
+ALLOWED_PARAMS = set(inspect.signature(iterate_genetic_algorithm).parameters) - EXCLUDED_PARAMS
+# Intervalle minimal (secondes) entre deux mises à jour de progression d'un job
+PROGRESS_INTERVAL = 0.2
+
+# État de chaque processus worker : file de progression et Room déjà construites
+WORKER_STATE = {}
+
+
+def json_ready(value):
+    """ Convertit récursivement les types numpy (et tuples) en types JSON """
+    if isinstance(value, dict):
+        return {str(key): json_ready(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_ready(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def parse_job(payload):
+    """
+    Valide une requête de job. Retourne (plan, options) : plan décrit la pièce
+    (corners, holes, sample_step, tile_size), options les paramètres de run_genetic_algorithm.
+    Lève ValueError si la requête est invalide.
+    """
+    if 'corners' not in payload or 'num_cameras' not in payload:
+        raise ValueError("Les champs 'corners' et 'num_cameras' sont obligatoires.")
+    plan = {
+        'corners': [[float(x), float(y)] for x, y in payload['corners']],
+        'holes': [[[float(x), float(y)] for x, y in hole] for hole in payload.get('holes', [])],
+        'sample_step': float(payload.get('sample_step', 1.0)),
+        'tile_size': payload.get('tile_size'),
+    }
+    if len(plan['corners']) < 3:
+        raise ValueError("Une pièce doit avoir au moins 3 coins.")
+    options = {
+        'num_cameras': int(payload['num_cameras']),
+        'fov': float(payload.get('fov', 90)),
+        'radius': float(payload.get('radius', 12)),
+    }
+    params = dict(payload.get('params', {}))
+    unknown = set(params) - ALLOWED_PARAMS
+    if unknown:
+        raise ValueError(f"Paramètres non acceptés : {', '.join(sorted(unknown))}")
+    if 'selection' in params and params['selection'] not in SELECTIONS:
+        raise ValueError(f"Sélection inconnue. Veuillez choisir entre {', '.join(SELECTIONS)}.")
+    options.update(params)
+    return plan, options
+
+
+def plan_key(plan):
+    return Room.plan_fingerprint(plan['corners'], plan['sample_step'], plan['holes'], plan['tile_size'])
+
+
+def job_key(plan, options):
+    """ Clé du cache de résultats : empreinte de la pièce et des paramètres """
+    h = hashlib.sha1(plan_key(plan).encode())
+    h.update(json.dumps(options, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def init_worker(progress_queue, max_rooms):
+    WORKER_STATE.update({'progress': progress_queue, 'rooms': OrderedDict(), 'max_rooms': max_rooms})
+
+
+def worker_room(plan):
+    """ Room du plan, construite une seule fois par worker (les plus anciennes sont oubliées) """
+    rooms = WORKER_STATE['rooms']
+    key = plan_key(plan)
+    if key in rooms:
+        rooms.move_to_end(key)
+    else:
+        rooms[key] = Room(plan['corners'], sample_step=plan['sample_step'],
+                          holes=plan['holes'], tile_size=plan['tile_size'])
+        while len(rooms) > WORKER_STATE['max_rooms']:
+            rooms.popitem(last=False)
+    return rooms[key]
+
+
+def run_job(job_id, plan, options):
+    """ Tâche d'un worker : exécute le GA, envoie la progression, retourne le résultat (JSON) """
+    room = worker_room(plan)
+    options = dict(options)
+    if 'selection' in options:
+        options['selection'] = SELECTIONS[options['selection']]
+    run = iterate_genetic_algorithm(room, **options)
+    last_sent = 0.0
+    while True:
+        try:
+            record = next(run)
+        except StopIteration as stop:
+            best_individual, stats = stop.value
+            break
+        now = time.perf_counter()
+        if now - last_sent >= PROGRESS_INTERVAL:
+            WORKER_STATE['progress'].put((job_id, json_ready(record)))
+            last_sent = now
+    return json_ready({
+        'best_genes': best_individual.genes,
+        'best_fitness': best_individual.fitness,
+        'stats': stats,
+        'num_sample_points': len(room.sample_points),
+    })
+
+
+class Job:
+    def __init__(self, key, max_events=256):
+        """ key : clé du cache de résultats (None si la requête n'est pas reproductible) """
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.status = 'queued'
+        self.cached = False
+        # Seules les dernières mises à jour sont gardées ; event_count compte toutes celles publiées
+        self.events = deque(maxlen=max_events)
+        self.event_count = 0
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.changed = asyncio.Condition()
+
+    def summary(self):
+        summary = {'job_id': self.id, 'status': self.status, 'cached': self.cached}
+        if self.events:
+            summary['progress'] = self.events[-1]
+        if self.result is not None:
+            summary['result'] = self.result
+        if self.error is not None:
+            summary['error'] = self.error
+        return summary
+
+    async def publish(self, event=None, status=None):
+        async with self.changed:
+            if event is not None:
+                self.events.append(event)
+                self.event_count += 1
+            # Un état final n'est plus modifié (progression relayée en retard)
+            if status is not None and self.status not in ('done', 'failed'):
+                self.status = status
+                if status in ('done', 'failed'):
+                    self.finished_at = time.monotonic()
+            self.changed.notify_all()
+
+
+class JobService:
+    def __init__(self, workers=2, max_pending=8, cache_size=128, max_rooms=4, max_jobs=1024,
+                 job_ttl=3600.0, max_events=256):
+        """
+        workers : processus du pool, max_pending : jobs acceptés non terminés au maximum,
+        cache_size : résultats gardés (LRU), max_rooms : Room gardées par worker,
+        max_jobs / job_ttl : jobs terminés gardés au maximum / durée (secondes) pendant laquelle
+        ils restent consultables, max_events : mises à jour de progression gardées par job.
+        """
+        self.max_pending = max_pending
+        self.cache_size = cache_size
+        self.max_jobs = max_jobs
+        self.job_ttl = job_ttl
+        self.max_events = max_events
+        self.jobs = {}
+        # Jobs terminés, du plus ancien au plus récent (job_id -> instant de fin)
+        self.finished = OrderedDict()
+        self.running = {}
+        self.results = OrderedDict()
+        self.progress = multiprocessing.Queue()
+        self.pool = multiprocessing.Pool(workers, initializer=init_worker, initargs=(self.progress, max_rooms))
+        self.loop = None
+        self.pump = None
+
+    async def start(self):
+        # Un thread relaie la progression des workers vers la boucle asyncio
+        self.loop = asyncio.get_running_loop()
+        self.pump = threading.Thread(target=self.pump_progress, daemon=True)
+        self.pump.start()
+
+    def pump_progress(self):
+        while True:
+            try:
+                item = self.progress.get()
+            except (EOFError, OSError):
+                return
+            if item is None:
+                return
+            job_id, record = item
+            job = self.jobs.get(job_id)
+            if job is not None:
+                asyncio.run_coroutine_threadsafe(job.publish(record, 'running'), self.loop)
+
+    def submit(self, payload):
+        """
+        Crée (ou retrouve) le job d'une requête ; lève ValueError ou OverflowError (service plein).
+        Sans graine, le résultat est aléatoire : chaque requête a son propre job, jamais mis en cache.
+        """
+        plan, options = parse_job(payload)
+        self.forget_finished()
+        key = job_key(plan, options) if options.get('seed') is not None else None
+        if key is not None and key in self.running:
+            return self.running[key]
+
+        job = Job(key, self.max_events)
+        if key is not None and key in self.results:
+            self.results.move_to_end(key)
+            job.status, job.cached, job.result = 'done', True, self.results[key]
+            job.finished_at = time.monotonic()
+            self.finished[job.id] = job.finished_at
+        elif len(self.pending()) >= self.max_pending:
+            raise OverflowError("Trop de jobs en cours, réessayez plus tard.")
+        else:
+            if key is not None:
+                self.running[key] = job
+            asyncio.ensure_future(self.execute(job, plan, options))
+        self.jobs[job.id] = job
+        return job
+
+    def pending(self):
+        """ Jobs acceptés pas encore terminés """
+        return [job for job in self.jobs.values() if job.finished_at is None]
+
+    def forget_finished(self):
+        """ Oublie les jobs terminés depuis plus de job_ttl secondes, puis les plus anciens au-delà de max_jobs """
+        now = time.monotonic()
+        while self.finished:
+            job_id, finished_at = next(iter(self.finished.items()))
+            if now - finished_at < self.job_ttl and len(self.finished) <= self.max_jobs:
+                break
+            del self.finished[job_id]
+            self.jobs.pop(job_id, None)
+
+    async def execute(self, job, plan, options):
+        try:
+            future = self.loop.create_future()
+            self.pool.apply_async(
+                run_job, (job.id, plan, options),
+                callback=lambda result: self.loop.call_soon_threadsafe(settle, future, result),
+                error_callback=lambda error: self.loop.call_soon_threadsafe(settle, future, None, error))
+            job.result = await future
+            if job.key is not None:
+                self.results[job.key] = job.result
+                while len(self.results) > self.cache_size:
+                    self.results.popitem(last=False)
+            await job.publish(status='done')
+        except Exception as error:
+            job.error = f"{type(error).__name__}: {error}"
+            await job.publish(status='failed')
+        finally:
+            if job.key is not None:
+                self.running.pop(job.key, None)
+            self.finished[job.id] = job.finished_at or time.monotonic()
+            self.forget_finished()
+
+    async def stream(self, job):
+        """
+        Événements d'un job (progression puis état final), au fil de l'eau. Un client trop lent
+        saute les mises à jour qui ne sont plus gardées (voir max_events).
+        """
+        sent = 0
+        while True:
+            async with job.changed:
+                await job.changed.wait_for(lambda: job.event_count > sent or job.status in ('done', 'failed'))
+                missing = min(job.event_count - sent, len(job.events))
+                events, status = list(job.events)[len(job.events) - missing:], job.status
+                sent = job.event_count
+            for event in events:
+                yield {'job_id': job.id, 'status': 'running', 'progress': event}
+            if status in ('done', 'failed'):
+                yield job.summary()
+                return
+
+    def close(self):
+        # Les jobs en cours sont abandonnés
+        self.pool.terminate()
+        self.progress.put(None)
+        if self.pump is not None:
+            self.pump.join(timeout=1.0)
+
+    async def handle(self, reader, writer):
+        """ Une connexion HTTP/1.1 (une requête, puis fermeture) """
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode('latin-1').strip()
+                if not line:
+                    break
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+            if len(request_line) < 2:
+                return
+            method, path = request_line[0], request_line[1].rstrip('/')
+            body = await reader.readexactly(int(headers.get('content-length', 0)))
+            await self.route(method, path, body, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def route(self, method, path, body, writer):
+        parts = path.strip('/').split('/')
+        if method == 'POST' and parts == ['jobs']:
+            try:
+                job = self.submit(json.loads(body or b'{}'))
+            except (ValueError, TypeError, KeyError) as error:
+                return await respond(writer, 400, {'error': str(error)})
+            except OverflowError as error:
+                return await respond(writer, 503, {'error': str(error)})
+            return await respond(writer, 202, job.summary())
+
+        if method == 'GET' and len(parts) in (2, 3) and parts[0] == 'jobs':
+            job = self.jobs.get(parts[1])
+            if job is None:
+                return await respond(writer, 404, {'error': "Job inconnu."})
+            if len(parts) == 2:
+                return await respond(writer, 200, job.summary())
+            if parts[2] == 'events':
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                             b"Connection: close\r\n\r\n")
+                async for event in self.stream(job):
+                    writer.write(json.dumps(event).encode() + b"\n")
+                    await writer.drain()
+                return
+        return await respond(writer, 404, {'error': "Ressource inconnue."})
+
+
+def settle(future, result=None, error=None):
+    """ Termine un futur asyncio depuis le résultat d'un worker (s'il n'est pas déjà terminé) """
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+async def respond(writer, status, payload):
+    reasons = {200: 'OK', 202: 'Accepted', 400: 'Bad Request', 404: 'Not Found', 503: 'Service Unavailable'}
+    body = json.dumps(payload).encode()
+    writer.write(f"HTTP/1.1 {status} {reasons[status]}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+    await writer.drain()
+
+
+async def serve(host='127.0.0.1', port=8765, **options):
+    """ Lance le service jusqu'à interruption (Ctrl-C ou SIGTERM) """
+    service = JobService(**options)
+    await service.start()
+    server = await asyncio.start_server(service.handle, host, port)
+    print(f"Service d'optimisation sur http://{host}:{port}")
+    stop = asyncio.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            asyncio.get_running_loop().add_signal_handler(signum, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows : Ctrl-C interrompt asyncio.run directement
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Service local d'optimisation de placement de caméras")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--max-pending', type=int, default=8)
+    parser.add_argument('--cache-size', type=int, default=128)
+    parser.add_argument('--max-jobs', type=int, default=1024)
+    parser.add_argument('--job-ttl', type=float, default=3600.0)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(port=args.port, workers=args.workers, max_pending=args.max_pending,
+                          cache_size=args.cache_size, max_jobs=args.max_jobs, job_ttl=args.job_ttl))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import csv
+import inspect
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+import numpy as np
+from utils import run_genetic_algorithm, iterate_genetic_algorithm
+
+# Colonnes de l'index (mêmes noms et unités que genetic_algorithm_results.csv, plus celles du balayage)
+INDEX_COLUMNS = [
+    'run_id', 'timestamp', 'selection_type', 'num_cameras', 'pop_size', 'generations',
+    'fov', 'radius', 'mutation_rate', 'mutation_strength', 'elitism_strategy',
+    'crossover_type', 'final_max_score', 'final_min_score', 'final_avg_score',
+    'final_std_score', 'num_sample_points', 'camera_positions',
+    'repeat', 'seed', 'options', 'stop_reason', 'evaluations', 'elapsed', 'history_file',
+]
+# Paramètres qui ont leur propre colonne ; les autres options vont dans la colonne JSON 'options'
+PARAMETER_COLUMNS = ('num_cameras', 'pop_size', 'generations', 'fov', 'radius',
+                     'mutation_rate', 'mutation_strength')
+# Historiques par génération stockés dans le fichier .npz de chaque exécution
+HISTORY_KEYS = ('best_scores', 'min_scores', 'avg_scores', 'std_scores')
+
+# Pièce du processus worker (transmise une seule fois par init_worker)
+WORKER_STATE = {}
+
+
+def parameter_grid(grid):
+    """
+    Toutes les combinaisons d'une grille de paramètres, par exemple
+    {'fov': [45, 90], 'radius': [6, 12]} -> 4 configurations (dictionnaires).
+    """
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+
+def init_worker(room):
+    WORKER_STATE['room'] = room
+
+
+def run_configuration(run_id, config, repeat, seed, store):
+    """
+    Tâche d'un worker : une exécution de run_genetic_algorithm pour une configuration.
+    Les historiques complets et le meilleur individu sont écrits dans runs/<run_id>.npz
+    (écriture atomique) ; retourne la ligne d'index correspondante.
+    """
+    room = WORKER_STATE['room']
+    # Les opérateurs de utils passent par leurs versions par lot (générateur numpy de seed) ;
+    # seul un opérateur personnalisé appelé parent par parent peut utiliser le module random
+    random.seed(seed)
+    start = time.perf_counter()
+    best_individual, stats = run_genetic_algorithm(room, seed=seed, **config)
+    elapsed = time.perf_counter() - start
+
+    history_file = os.path.join('runs', f"{run_id:06d}.npz")
+    path = os.path.join(store, history_file)
+    with open(f"{path}.tmp", 'wb') as f:
+        np.savez(f, best_genes=np.asarray(best_individual.genes, dtype=float),
+                 **{key: np.asarray(stats[key], dtype=float) for key in HISTORY_KEYS})
+    os.replace(f"{path}.tmp", path)
+
+    selection = config.get('selection')
+    camera_positions = '; '.join(
+        f"C{i+1}(x={cam.x:.2f},y={cam.y:.2f},angle={np.degrees(cam.orientation):.2f})"
+        for i, cam in enumerate(best_individual.get_cameras())
+    )
+    row = {
+        'run_id': run_id,
+        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'selection_type': selection.__name__ if selection is not None else 'Roulette Wheel',
+        'elitism_strategy': 'Top 50%',
+        'crossover_type': 'Uniform',
+        'final_max_score': stats['best_scores'][-1] * 100,
+        'final_min_score': stats['min_scores'][-1] * 100,
+        'final_avg_score': stats['avg_scores'][-1] * 100,
+        'final_std_score': stats['std_scores'][-1] * 100,
+        'num_sample_points': len(room.sample_points),
+        'camera_positions': camera_positions,
+        'repeat': repeat,
+        'seed': seed,
+        'options': json.dumps({key: value for key, value in config.items()
+                               if key not in PARAMETER_COLUMNS and key != 'selection'},
+                              sort_keys=True, default=str),
+        'stop_reason': stats['stop_reason'],
+        'evaluations': stats['evaluations'],
+        'elapsed': elapsed,
+        'history_file': history_file,
+    }
+    defaults = inspect.signature(iterate_genetic_algorithm).parameters
+    row.update({key: config.get(key, defaults[key].default) for key in PARAMETER_COLUMNS})
+    return row
+
+
+def next_run_id(index_path):
+    """ Premier identifiant libre de l'index (0 si l'index n'existe pas encore) """
+    if not os.path.exists(index_path):
+        return 0
+    with open(index_path, newline='', encoding='utf-8') as f:
+        return max((int(row['run_id']) for row in csv.DictReader(f)), default=-1) + 1
+
+
+def run_sweep(room, grid, repeats=1, store='sweep_results', workers=None, seed=None, **options):
+    """
+    Balayage de paramètres : chaque configuration de parameter_grid(grid) est exécutée repeats fois,
+    en parallèle sur un pool de workers processus. options : paramètres communs de
+    run_genetic_algorithm (num_cameras, generations, evaluation...), écrasés par ceux de la grille.
+    Résultats stockés dans le dossier store, complété à chaque balayage :
+    - index.csv : une ligne par exécution (paramètres et scores finaux), ajoutée dès qu'elle se termine
+    - runs/<run_id>.npz : historiques par génération (HISTORY_KEYS) et gènes du meilleur individu
+    Retourne les lignes d'index ajoutées, dans l'ordre des run_id.
+    """
+    configurations = [dict(options, **config) for config in parameter_grid(grid)]
+    tasks = [(config, repeat) for config in configurations for repeat in range(repeats)]
+    seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(len(tasks))]
+
+    os.makedirs(os.path.join(store, 'runs'), exist_ok=True)
+    index_path = os.path.join(store, 'index.csv')
+    first_id = next_run_id(index_path)
+
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(room,)) as pool:
+        futures = [
+            pool.submit(run_configuration, first_id + i, config, repeat, seeds[i], store)
+            for i, (config, repeat) in enumerate(tasks)
+        ]
+        # Seul le processus principal écrit l'index : pas d'écritures concurrentes
+        for future in as_completed(futures):
+            row = future.result()
+            write_header = not os.path.exists(index_path)
+            with open(index_path, 'a', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=INDEX_COLUMNS)
+                if write_header:
+                    writer.writeheader()
+                writer.writerow(row)
+            rows.append(row)
+    return sorted(rows, key=lambda row: row['run_id'])
+
+
+def load_histories(store, history_files, keys=HISTORY_KEYS):
+    """
+    Historiques par génération de plusieurs exécutions (colonne history_file de l'index).
+    Seuls les tableaux demandés (keys) sont lus dans chaque .npz.
+    Retourne une liste de dictionnaires {clé: tableau}.
+    """
+    histories = []
+    for history_file in history_files:
+        with np.load(os.path.join(store, history_file)) as data:
+            histories.append({key: data[key] for key in keys})
+    return histories
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from Room import Room
+
+ROOMS = {
+    'carre': Room.get_room(1),
+    'decoupe': Room.get_room(2),
+    'L': Room.get_room(3),
+    'trou': Room([(0, 0), (20, 0), (20, 20), (0, 20)], holes=[[(5, 5), (15, 5), (15, 15), (5, 15)]]),
+    'concave_trou': Room([(0, 0), (10, 0), (12, 7), (5, 11), (-3, 6)], holes=[[(3, 3), (6, 3), (4, 6)]]),
+}
+
+
+@pytest.mark.parametrize('name', ROOMS)
+def test_are_points_inside_matches_is_point_inside(name):
+    """
+    are_points_inside donne le même résultat que is_point_inside sur des points aléatoires,
+    les coins, des points posés exactement sur les arêtes et les points d'échantillonnage.
+    """
+    room = ROOMS[name]
+    rng = np.random.default_rng(0)
+    min_x, max_x, min_y, max_y = room.bounds
+    margin = 1.0
+    random_points = np.column_stack([
+        rng.uniform(min_x - margin, max_x + margin, 10000),
+        rng.uniform(min_y - margin, max_y + margin, 10000),
+    ])
+    walls = room.walls()
+    p1, p2 = walls[:, 0], walls[:, 1]
+    t = np.linspace(0, 1, 11)[:, None, None]
+    edge_points = (p1 + t * (p2 - p1)).reshape(-1, 2)
+    points = np.vstack([random_points, p1, edge_points, room.sample_points.reshape(-1, 2)])
+
+    batch = room.are_points_inside(points)
+    mismatches = [tuple(p) for p, inside in zip(points, batch) if inside != room.is_point_inside(p)]
+    assert mismatches == []
+
+
+def test_are_points_inside_small_chunks():
+    room = ROOMS['trou']
+    points = np.random.default_rng(1).uniform(-1, 21, size=(5000, 2))
+    assert np.array_equal(room.are_points_inside(points), room.are_points_inside(points, chunk_size=7))
+
+
+@pytest.mark.parametrize('name', ROOMS)
+def test_random_points_inside_are_inside(name):
+    room = ROOMS[name]
+    points = room.random_points_inside(20000, np.random.default_rng(0))
+    assert room.are_points_inside(points).all()
+
+
+@pytest.mark.parametrize('name', ROOMS)
+@pytest.mark.parametrize('strength', [3.0, 30.0])
+def test_clipped_moves_stay_inside(name, strength):
+    """ Une marche aléatoire de déplacements bornés par clip_moves ne sort jamais de la pièce """
+    room = ROOMS[name]
+    rng = np.random.default_rng(0)
+    positions = room.random_points_inside(2000, rng)
+    for _ in range(20):
+        positions = room.clip_moves(positions, positions + rng.uniform(-strength, strength, size=positions.shape))
+        assert room.are_points_inside(positions).all()
+
+
+def test_clip_moves_from_a_wall():
+    # Caméra posée sur le mur x = 10 de la pièce en L, déplacement vers l'extérieur
+    room = ROOMS['L']
+    position = room.clip_moves([(10.0, 2.45)], [(10.93, 2.42)])
+    assert room.are_points_inside(position).all()
+
+
+@pytest.mark.parametrize('name', ROOMS)
+def test_sample_levels_are_nested(name):
+    """ Les niveaux multiples du pas de la pièce sont des sous-ensembles de sa grille, le dernier est la pièce """
+    room = ROOMS[name]
+    levels = room.build_sample_levels((4 * room.sample_step, 2 * room.sample_step))
+    assert levels[-1] is room
+    fine = set(map(tuple, room.sample_points))
+    for level in levels:
+        assert set(map(tuple, level.sample_points)) <= fine
@@ -1,14 +1,57 @@
+import os
 import random
+import time
+from types import SimpleNamespace
 import numpy as np
 from Camera import Camera
 from Room import Room
 from Individual import Individual
+from Population import Population
+from CoverageCache import CoverageCache
+from ParallelEvaluator import ParallelEvaluator
+from LineOfSight import LineOfSightTable
+from local_search import refine
+from checkpoint import save_checkpoint, load_checkpoint, check_parameters, restore_rng
+import profiling
+from profiling import Profiler
+from selection import roulette_selection_batch, rank_selection_batch, tournament_selection_batch
+from coverage import cameras_to_arrays, visibility_chunks
 
-def calculate_fitness(room: Room, individual: Individual):
+def calculate_fitness(room: Room, individual: Individual, line_of_sight=None, chunk_size: int = 4096):
     """
     Calcule le pourcentage de points couverts par les caméras d'un individu.
     room: la Room contenant les points d'échantillonnage
     individual: l'individu dont on évalue les caméras (ou liste de caméras)
+    line_of_sight: LineOfSightTable optionnelle pour tenir compte des murs (occlusion)
+    Retourne un float entre 0.0 (0%) et 1.0 (100%).
+    Le calcul est vectorisé (voir coverage.py) : une matrice caméras x points en quelques opérations numpy,
+    par paquets de chunk_size points pour borner la mémoire (comme coverage.population_coverage).
+    """
+    sample_points = room.sample_points
+
+    if len(sample_points) == 0:
+        return 0.0
+
+    if isinstance(individual, Individual):
+        cameras = individual.get_cameras()
+    else:
+        cameras = individual
+
+    if len(cameras) == 0:
+        return 0.0
+
+    covered_count = 0
+    for _, visibility in visibility_chunks(cameras_to_arrays(cameras), sample_points, chunk_size, line_of_sight):
+        covered_count += np.count_nonzero(np.any(visibility, axis=0))
+    return covered_count / len(sample_points)
+
+
+def calculate_fitness_reference(room: Room, individual: Individual):
+    """
+    Version de référence (boucle Python point par point, caméra par caméra).
+    Plus lente, elle sert à vérifier que calculate_fitness donne exactement le même résultat.
+    room: la Room contenant les points d'échantillonnage
+    individual: l'individu dont on évalue les caméras (ou liste de caméras)
     Retourne un float entre 0.0 (0%) et 1.0 (100%).
     """
     sample_points = room.sample_points
@@ -82,7 +125,78 @@ def rank_selection(population: list):
     return ranked_population[selected_index]
 
 
-def run_genetic_algorithm(
+# Équivalents "par lot" (selection.py) des opérateurs ci-dessus
+BATCH_SELECTIONS = {
+    roulette_wheel_selection: roulette_selection_batch,
+    select_parent: tournament_selection_batch,
+    rank_selection: rank_selection_batch,
+}
+
+
+def per_pick_selection(selection):
+    """
+    Adapte un opérateur "un parent par appel" (liste d'individus -> individu)
+    à la signature par lot (fitness, count, rng) -> indices.
+    """
+    def batch(fitness, count, rng):
+        candidates = [SimpleNamespace(fitness=f, index=i) for i, f in enumerate(fitness)]
+        return np.array([selection(candidates).index for _ in range(count)], dtype=int)
+    return batch
+
+
+def as_batch_selection(selection):
+    """
+    Opérateur par lot correspondant à selection : les opérateurs de utils sont remplacés par
+    leur version par lot (une distribution par génération, O(1) par parent), les opérateurs
+    par lot sont gardés tels quels, les autres sont appelés une fois par parent.
+    """
+    if selection is None:
+        return None
+    if selection in BATCH_SELECTIONS:
+        return BATCH_SELECTIONS[selection]
+    if selection in BATCH_SELECTIONS.values():
+        return selection
+    return per_pick_selection(selection)
+
+
+def new_stats():
+    """ Dictionnaire vide des statistiques par génération """
+    return {
+        'best_scores': [],
+        'min_scores': [],
+        'avg_scores': [],
+        'std_scores': []
+    }
+
+
+def record_generation(stats, fitness_values):
+    """ Ajoute aux statistiques une génération (fitness triées du meilleur au moins bon) """
+    stats['best_scores'].append(float(fitness_values[0]))
+    stats['min_scores'].append(float(np.min(fitness_values)))
+    stats['avg_scores'].append(np.mean(fitness_values))
+    stats['std_scores'].append(np.std(fitness_values))
+
+
+def stopping_reason(best_scores, evaluations, elapsed, stagnation_generations=None,
+                    stagnation_tolerance=0.0, target_coverage=None, time_budget=None,
+                    max_evaluations=None):
+    """
+    Raison d'arrêter l'algorithme après la dernière génération enregistrée,
+    ou None s'il faut continuer.
+    """
+    if target_coverage is not None and best_scores[-1] >= target_coverage:
+        return "target"
+    if (stagnation_generations is not None and len(best_scores) > stagnation_generations
+            and best_scores[-1] - best_scores[-1 - stagnation_generations] <= stagnation_tolerance):
+        return "stagnation"
+    if max_evaluations is not None and evaluations >= max_evaluations:
+        return "max_evaluations"
+    if time_budget is not None and elapsed >= time_budget:
+        return "time_budget"
+    return None
+
+
+def iterate_genetic_algorithm(
     room: Room,
     num_cameras: int,
     pop_size: int = 20,
@@ -91,70 +205,389 @@ def run_genetic_algorithm(
     radius: float = 12,
     mutation_rate: float = 0.2,
     mutation_strength: float = 1.5,
+    evaluation: str = "batch",
+    chunk_size: int = 4096,
+    seed=None,
+    cache_bytes: int = 64 * 1024**2,
+    workers: int = None,
+    selection=None,
+    occlusion: bool = False,
+    sample_steps=None,
+    level_every: int = None,
+    level_spread: float = None,
+    racing_sample: int = 512,
+    racing_delta: float = 0.05,
+    initial_genes=None,
+    local_search_every: int = None,
+    local_search_top: int = 3,
+    local_search_options=None,
+    stagnation_generations: int = None,
+    stagnation_tolerance: float = 0.0,
+    target_coverage: float = None,
+    time_budget: float = None,
+    max_evaluations: int = None,
+    checkpoint_path: str = None,
+    checkpoint_interval: float = 5.0,
+    resume: bool = False,
+    keep_history: bool = True,
+    profile=False,
 ):
     """
-    Évolution génétique :
+    Évolution génétique, sous forme de générateur :
     - Conserve la meilleure moitié de la population (élitisme fort).
     - Complète l'autre moitié avec de nouveaux enfants issus de croisements/mutations.
     - Les parents sont re-sélectionnés à chaque création d'enfant dans la génération A.
-    Retourne le meilleur individu rencontré et l'historique des meilleurs scores.
+    Produit un enregistrement par génération (voir generation_record) au fil de l'exécution ;
+    le consommateur peut s'arrêter quand il veut (les workers sont alors libérés).
+    Valeur de retour du générateur (StopIteration.value) : le meilleur individu rencontré et les
+    statistiques, comme run_genetic_algorithm.
+    keep_history : avec False, les listes de stats['best_scores'] etc. ne gardent que les dernières
+    générations utiles au critère de stagnation (l'historique complet reste au consommateur).
+    evaluation :
+    - "batch" : toute la génération en un calcul vectorisé, par paquets de chunk_size points
+    - "indexed" : chaque caméra n'est testée que sur les points à sa portée (index spatial de la pièce)
+    - "tiled" : évaluation tuile par tuile (Room.get_tiles, points float32) : seules les tuiles à portée
+      d'une caméra sont lues, pour les très grandes pièces (créées avec tile_size, voir floorplan.py)
+    - "incremental" : chaque individu garde ses compteurs de couverture par point,
+      seules les caméras mutées des enfants sont recalculées
+    - "cache" : comme "batch", mais la couverture de chaque caméra est gardée en bitset
+      dans un CoverageCache de cache_bytes octets
+    - "racing" : chaque enfant est d'abord noté sur racing_sample points tirés au hasard ;
+      seuls ceux dont la borne haute (confiance 1 - racing_delta) peut atteindre le seuil des
+      survivants sont évalués sur tous les points. Les autres gardent leur estimation
+      (stats['racing'] compte les évaluations complètes évitées)
+    - "individual" : un appel à calculate_fitness par individu
+    workers : avec evaluation="batch", répartit l'évaluation sur un pool de workers processus
+    (voir ParallelEvaluator.py) ; le résultat est identique à l'exécution en série.
+    selection : opérateur de sélection (roulette_wheel_selection, select_parent, rank_selection,
+    ou un opérateur par lot de selection.py) ; tous les parents d'une génération sont tirés d'un coup
+    (voir as_batch_selection). Par défaut, la roulette.
+    occlusion : tient compte des murs (un point caché par un coin de la pièce n'est pas vu),
+    grâce à une table de ligne de vue précalculée par case (voir LineOfSight.py).
+    Disponible avec evaluation="batch" ou "individual".
+    sample_steps : échantillonnage multi-résolution, liste de pas du plus grossier au plus fin
+    (par exemple [2.0, 1.0, 0.5]) ; le dernier niveau est toujours le pas de la pièce
+    (voir Room.build_sample_levels). On passe au niveau suivant tous les level_every générations
+    et/ou quand l'écart-type de la population descend sous level_spread ; toute la population
+    (élites comprises) et le meilleur individu sont alors ré-évalués sur la nouvelle grille.
+    Disponible avec evaluation="batch", "indexed", "tiled" ou "individual".
+    initial_genes : tableau (k, num_cameras, 3) placé en tête de la génération 0 à la place
+    d'individus aléatoires (par exemple candidates.greedy_initial_genes).
+    local_search_every : étape mémétique optionnelle, tous les local_search_every générations les
+    local_search_top meilleurs individus sont affinés par recherche locale (voir local_search.refine,
+    options dans le dictionnaire local_search_options) puis remis dans la population.
+    Critères d'arrêt (en plus du nombre de générations) :
+    - stagnation_generations : le meilleur score n'a pas progressé de plus de stagnation_tolerance
+      sur les stagnation_generations dernières générations
+    - target_coverage : couverture visée atteinte (fraction entre 0 et 1)
+    - time_budget : temps de calcul maximal, en secondes (le temps passé par l'appelant entre deux
+      générations, pendant le yield, n'est pas compté)
+    - max_evaluations : nombre maximal d'évaluations de fitness
+    stats['stop_reason'] donne la raison de l'arrêt et stats['evaluations'] le nombre d'évaluations.
+    checkpoint_path : fichier de checkpoint (.npz) écrit de façon atomique au plus toutes les
+    checkpoint_interval secondes, et à la fin de l'exécution (gènes, fitness, meilleur individu,
+    statistiques, état du générateur aléatoire, raison de l'arrêt). Avec resume=True, l'exécution
+    reprend exactement là où le checkpoint s'était arrêté (si le fichier existe) ; un checkpoint
+    écrit avec d'autres pop_size, num_cameras, fov, radius, seed ou evaluation lève ValueError.
+    profile : instrumentation (True, ou un profiling.Profiler, par exemple Profiler(trace=True)) ;
+    stats['profile'] donne alors le temps de chaque phase par génération (évaluation, tri, sélection,
+    croisement, mutation...) et des compteurs (évaluations de fitness, tests de visibilité
+    caméra x point, tests point-dans-polygone, mutations bornées par un mur), exportables avec
+    profiling.export_json / export_trace. Désactivée, elle ne coûte qu'un test par point de mesure.
+    La population est stockée dans des tableaux numpy (voir Population.py) ;
+    seed initialise le générateur aléatoire pour rendre une exécution reproductible.
     """
+    if evaluation not in ("batch", "indexed", "tiled", "incremental", "cache", "racing", "individual"):
+        raise ValueError("Mode d'évaluation inconnu. Veuillez choisir entre 'batch', 'indexed', 'tiled', "
+                         "'incremental', 'cache', 'racing' et 'individual'.")
+
+    parallel = workers is not None and workers > 1
+    if occlusion and (evaluation not in ("batch", "individual") or parallel):
+        raise ValueError("L'occlusion n'est disponible qu'avec evaluation='batch' ou 'individual' (sans workers).")
+    if parallel and evaluation != "batch":
+        raise ValueError("L'évaluation parallèle (workers) n'est disponible qu'avec evaluation='batch'.")
+    if sample_steps and (evaluation not in ("batch", "indexed", "tiled", "racing", "individual") or parallel):
+        raise ValueError("Le multi-résolution n'est disponible qu'avec evaluation='batch', 'indexed', "
+                         "'tiled', 'racing' ou 'individual' (sans workers).")
+
+    if local_search_every and evaluation == "incremental":
+        raise ValueError("La recherche locale n'est pas disponible avec evaluation='incremental'.")
+
+    selection = as_batch_selection(selection)
+    checkpoint = None
+    # Paramètres qui doivent être les mêmes pour reprendre une exécution depuis son checkpoint
+    run_parameters = {'pop_size': pop_size, 'num_cameras': num_cameras, 'fov': fov, 'radius': radius,
+                      'seed': seed, 'evaluation': evaluation}
+    if resume and checkpoint_path and os.path.exists(checkpoint_path):
+        checkpoint = load_checkpoint(checkpoint_path)
+        check_parameters(checkpoint[4], run_parameters)
+
+    # Niveaux d'échantillonnage : la pièce "eval_room" porte les points du niveau courant
+    levels = room.build_sample_levels(sample_steps) if sample_steps else [room]
+    level, level_start = 0, 0
+    if checkpoint is None:
+        rng = np.random.default_rng(seed)
+        stats = new_stats()
+        if sample_steps:
+            stats['levels'] = [(0, levels[0].sample_step)]
+    else:
+        genes, fitness, best_genes, stats, meta = checkpoint
+        rng = restore_rng(meta)
+        if 'levels' in stats:
+            stats['levels'] = [tuple(entry) for entry in stats['levels']]
+        level, level_start = meta['level'], meta['level_start']
+    eval_room = levels[level]
+
+    cache = CoverageCache(room, fov, radius, max_bytes=cache_bytes) if evaluation == "cache" else None
+    spatial_index = eval_room.get_spatial_index() if evaluation == "indexed" else None
+    tiles = eval_room.get_tiles() if evaluation == "tiled" else None
+    line_of_sight = LineOfSightTable(eval_room, radius=radius) if occlusion else None
+    evaluator = ParallelEvaluator(room, fov, radius, workers, chunk_size=chunk_size) if parallel else None
 
-    # Génération 0
-    population = [Individual(room, num_cameras, fov, radius) for _ in range(pop_size)]
-    best_scores = []
-    min_scores = []
-    avg_scores = []
-    std_scores = []
     best_individual = None
     best_fitness = -1.0
+    full_evaluations = saved_evaluations = 0
+    evaluations = 0
+    stop_reason = "generations"
+    local_search = {'runs': 0, 'improvements': 0, 'camera_evaluations': 0}
+    first_generation = 0
+    elapsed_before = 0.0
+
+    # Instrumentation optionnelle : sans profiler, les points de mesure ne coûtent qu'un test.
+    # Le profiler n'est actif que pendant le calcul du générateur, jamais pendant le code du
+    # consommateur entre deux générations (ni pendant celui d'un autre générateur).
+    profiler = None
+    if profile:
+        profiler = profile if isinstance(profile, Profiler) else Profiler()
+    previous_profiler = profiler.activate() if profiler is not None else None
+    profiling_active = profiler is not None
+
+    try:
+        with profiling.phase('initialization'):
+            if checkpoint is None:
+                # Génération 0
+                population = Population.random(eval_room, num_cameras, fov, radius, pop_size, rng=rng,
+                                               track_coverage=(evaluation == "incremental"))
+                if initial_genes is not None:
+                    initial_genes = np.asarray(initial_genes, dtype=float)[:pop_size]
+                    population.genes[:len(initial_genes)] = initial_genes
+            else:
+                # Reprise : population, meilleur individu et compteurs du checkpoint
+                population = Population.from_arrays(eval_room, num_cameras, fov, radius, genes, fitness,
+                                                    rng=rng, track_coverage=(evaluation == "incremental"),
+                                                    dirty=meta['dirty'])
+                population.camera_evaluations = meta.get('camera_evaluations', 0)
+                if len(best_genes) > 0:
+                    best_fitness = meta['best_fitness']
+                    best_individual = Individual(eval_room, num_cameras, fov, radius, genes=best_genes)
+                    best_individual.set_fitness(best_fitness)
+                first_generation = meta['generation']
+                if meta.get('stop_reason'):
+                    # Exécution déjà arrêtée par un critère d'arrêt : rien à refaire
+                    stop_reason = meta['stop_reason']
+                    first_generation = generations
+                evaluations = meta['evaluations']
+                full_evaluations, saved_evaluations = meta['full_evaluations'], meta['saved_evaluations']
+                local_search = meta['local_search']
+                elapsed_before = meta['elapsed']
+
+        start_time = time.perf_counter() - elapsed_before
+        last_checkpoint = time.perf_counter()
+
+        def write_checkpoint(next_generation, reason=None):
+            with profiling.phase('checkpoint'):
+                save_checkpoint(checkpoint_path, population, stats, best_individual, rng, {
+                    'generation': next_generation,
+                    'stop_reason': reason,
+                    'parameters': run_parameters,
+                    'camera_evaluations': population.camera_evaluations,
+                    'best_fitness': best_fitness,
+                    'evaluations': evaluations,
+                    'full_evaluations': full_evaluations,
+                    'saved_evaluations': saved_evaluations,
+                    'local_search': local_search,
+                    'level': level,
+                    'level_start': level_start,
+                    'elapsed': time.perf_counter() - start_time,
+                })
+
+        for generation in range(first_generation, generations):
+            if profiler is not None:
+                profiler.start_generation(generation)
+
+            # A. Évaluation
+            with profiling.phase('evaluation'):
+                pending = len(population.unevaluated())
+                evaluations += pending
+                profiling.count('fitness_evaluations', pending)
+                if evaluation == "racing":
+                    saved = population.evaluate_racing(racing_sample, racing_delta, chunk_size=chunk_size)
+                    saved_evaluations += saved
+                    full_evaluations += pending - saved
+                elif evaluation != "individual":
+                    population.evaluate(chunk_size=chunk_size, cache=cache, evaluator=evaluator,
+                                        spatial_index=spatial_index, line_of_sight=line_of_sight,
+                                        tiles=tiles)
+                else:
+                    for i in population.unevaluated():
+                        population.fitness[i] = calculate_fitness(eval_room, population.individual(i),
+                                                                  line_of_sight)
+
+            # B. Tri du meilleur au moins bon
+            with profiling.phase('sort'):
+                population.sort()
+
+            # Étape mémétique : recherche locale sur les meilleurs individus
+            if local_search_every and (generation + 1) % local_search_every == 0:
+                with profiling.phase('local_search'):
+                    for i in range(min(local_search_top, len(population))):
+                        genes, fitness, camera_evaluations = refine(
+                            population.genes[i], population.room, fov, radius,
+                            line_of_sight=line_of_sight, **(local_search_options or {}))
+                        local_search['runs'] += 1
+                        local_search['camera_evaluations'] += camera_evaluations
+                        if fitness > population.fitness[i]:
+                            population.genes[i] = genes
+                            population.fitness[i] = fitness
+                            local_search['improvements'] += 1
+                    population.sort()
+
+            with profiling.phase('statistics'):
+                # Mise à jour du meilleur global
+                if population.fitness[0] > best_fitness:
+                    best_fitness = float(population.fitness[0])
+                    best_individual = population.individual(0)
+
+                # Calcul des statistiques de la population
+                record_generation(stats, population.fitness)
+                if not keep_history:
+                    window = (stagnation_generations or 0) + 1
+                    for key in ('best_scores', 'min_scores', 'avg_scores', 'std_scores'):
+                        del stats[key][:-window]
+
+            record = generation_record(generation, stats, best_individual, evaluations,
+                                       time.perf_counter() - start_time)
+            if profiling_active:
+                Profiler.restore(previous_profiler)
+                profiling_active = False
+            # Le chronomètre est en pause pendant que l'appelant traite l'enregistrement
+            paused = time.perf_counter()
+            yield record
+            start_time += time.perf_counter() - paused
+            if profiler is not None:
+                previous_profiler = profiler.activate()
+                profiling_active = True
+
+            # Critères d'arrêt
+            stop_reason = stopping_reason(stats['best_scores'], evaluations, time.perf_counter() - start_time,
+                                          stagnation_generations, stagnation_tolerance, target_coverage,
+                                          time_budget, max_evaluations)
+            if stop_reason is not None:
+                # Checkpoint final : une reprise retrouve l'exécution terminée sans la refaire
+                if checkpoint_path:
+                    write_checkpoint(generation + 1, stop_reason)
+                break
+
+            # C. Nouvelle génération : la meilleure moitié est copiée directement,
+            # le reste est rempli d'enfants (roulette + croisement uniforme + mutation),
+            # phases "selection", "crossover" et "mutation" mesurées dans Population.next_generation
+            survivors_count = pop_size // 2
+            population = population.next_generation(survivors_count, mutation_rate, mutation_strength,
+                                                    selection=selection)
+
+            # D. Multi-résolution : passage à une grille plus fine
+            if level < len(levels) - 1:
+                elapsed = generation + 1 - level_start
+                if ((level_every and elapsed >= level_every)
+                        or (level_spread is not None and stats['std_scores'][-1] <= level_spread)):
+                    with profiling.phase('level_switch'):
+                        level, level_start = level + 1, generation + 1
+                        eval_room = levels[level]
+                        stats['levels'].append((generation + 1, eval_room.sample_step))
+                        if spatial_index is not None:
+                            spatial_index = eval_room.get_spatial_index()
+                        if tiles is not None:
+                            tiles = eval_room.get_tiles()
+                        if line_of_sight is not None:
+                            line_of_sight = LineOfSightTable(eval_room, radius=radius)
+                        # Les scores de l'ancienne grille ne sont plus comparables : on ré-évalue tout
+                        population.room = eval_room
+                        population.fitness[:] = np.nan
+                        best_individual.room = eval_room
+                        best_fitness = calculate_fitness(eval_room, best_individual, line_of_sight)
+                        best_individual.set_fitness(best_fitness)
+
+            # E. Checkpoint périodique (et à la dernière génération)
+            now = time.perf_counter()
+            if checkpoint_path and (now - last_checkpoint >= checkpoint_interval or generation == generations - 1):
+                write_checkpoint(generation + 1)
+                last_checkpoint = time.perf_counter()
+    finally:
+        if evaluator is not None:
+            evaluator.close()
+        if profiling_active:
+            Profiler.restore(previous_profiler)
 
-    for _ in range(generations):
-        # A. Évaluation
-        for ind in population:
-            if ind.fitness is None:
-                ind.set_fitness(calculate_fitness(room, ind))
-
-        # B. Tri du meilleur au moins bon
-        population.sort(key=lambda ind: ind.fitness, reverse=True)
-
-        # Mise à jour du meilleur global
-        if population[0].fitness > best_fitness:
-            best_fitness = population[0].fitness
-            best_individual = population[0]
-
-        # Calcul des statistiques de la population
-        fitness_values = [ind.fitness for ind in population]
-        best_scores.append(population[0].fitness)
-        min_scores.append(min(fitness_values))
-        avg_scores.append(np.mean(fitness_values))
-        std_scores.append(np.std(fitness_values))
-
-        # C. Nouvelle génération
-        survivors_count = pop_size // 2  # meilleure moitié
-        next_gen = population[:survivors_count]  # copie directe des meilleurs
-
-        # Remplissage avec de nouveaux enfants
-        while len(next_gen) < pop_size:
-            parent_a = roulette_wheel_selection(population)
-            parent_b = roulette_wheel_selection(population)
-
-            child1, child2 = parent_a.crossover(parent_b)
-            child1.mutate(mutation_rate=mutation_rate, mutation_strength=mutation_strength)
-            child2.mutate(mutation_rate=mutation_rate, mutation_strength=mutation_strength)
-
-            next_gen.append(child1)
-            if len(next_gen) < pop_size:
-                next_gen.append(child2)
-
-        population = next_gen
-
-    # Créer un dictionnaire avec toutes les statistiques
-    stats = {
-        'best_scores': best_scores,
-        'min_scores': min_scores,
-        'avg_scores': avg_scores,
-        'std_scores': std_scores
+    stats['stop_reason'] = stop_reason or "generations"
+    stats['evaluations'] = evaluations
+    if cache is not None:
+        stats['cache'] = cache.stats()
+    if evaluation == "incremental":
+        stats['camera_evaluations'] = population.camera_evaluations
+    if local_search_every:
+        stats['local_search'] = local_search
+    if evaluation == "racing":
+        stats['racing'] = {
+            'full_evaluations': full_evaluations,
+            'saved_evaluations': saved_evaluations,
+        }
+    if profiler is not None:
+        stats['profile'] = profiler.report()
+
+    return best_individual, stats
+
+
+def generation_record(generation, stats, best_individual, evaluations, elapsed):
+    """
+    Enregistrement léger produit par iterate_genetic_algorithm à chaque génération :
+    indice de génération, statistiques de la génération, meilleur individu rencontré
+    (fitness et copie des gènes), nombre d'évaluations et temps écoulé en secondes.
+    """
+    return {
+        'generation': generation,
+        'best_score': stats['best_scores'][-1],
+        'min_score': stats['min_scores'][-1],
+        'avg_score': float(stats['avg_scores'][-1]),
+        'std_score': float(stats['std_scores'][-1]),
+        'best_fitness': best_individual.fitness,
+        'best_genes': np.array(best_individual.genes, dtype=float),
+        'evaluations': evaluations,
+        'elapsed': elapsed,
     }
-    
-    return best_individual, stats
\ No newline at end of file
+
+
+def run_genetic_algorithm(
+    room: Room,
+    num_cameras: int,
+    pop_size: int = 20,
+    generations: int = 30,
+    fov: float = 90,
+    radius: float = 12,
+    mutation_rate: float = 0.2,
+    mutation_strength: float = 1.5,
+    **options,
+):
+    """
+    Exécute iterate_genetic_algorithm jusqu'au bout. Les paramètres principaux gardent leur
+    position historique ; les autres options (evaluation, seed, checkpoint_path...) sont passées
+    telles quelles à iterate_genetic_algorithm (voir sa documentation).
+    Retourne le meilleur individu rencontré et l'historique des statistiques.
+    """
+    steps = iterate_genetic_algorithm(room, num_cameras, pop_size=pop_size, generations=generations, fov=fov,
+                                      radius=radius, mutation_rate=mutation_rate,
+                                      mutation_strength=mutation_strength, **options)
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value